@@ -3,11 +3,15 @@ from .create_chords_and_melody import CreateChordsAndMelody
 from .data_loader import DataLoader
 from .safecast_loader import SafecastLoader
 from .time_series_pattern_analyzer import TimeSeriesPatternAnalyzer
+from .streaming_pattern_analyzer import StreamingPatternAnalyzer
 from .dataframe_selector import DataFrameSelector
 from .convert_element_to_aspect import ConvertElementToAspect
 from .suno_music_generator import SunoMusicGenerator
+from .suno_job_orchestrator import SunoJobOrchestrator
+from .suno_callback_receiver import SunoCallbackReceiver
 from .valence_arousal_to_emotion import ValenceArousalToEmotion
 from .crossfade_audio_files import CrossfadeAudioFiles
+from .pipeline_runner import PipelineRunner
 
 __all__ = [
     "Visualizer", 
@@ -18,11 +22,15 @@ __all__ = [
     "SafecastLoader", 
     "RandomSegmentPicker",
     "TimeSeriesPatternMiner", 
+    "StreamingPatternAnalyzer",
     "DataFrameSelector", 
     "ConvertElementToAspect", 
     "SunoMusicGenerator", 
+    "SunoJobOrchestrator",
+    "SunoCallbackReceiver",
     "ValenceArousalToEmotion",
     "FilterCommonTimestampRange",
     "TimeAlignedDataMerger",
-    "CrossfadeAudioFiles"
+    "CrossfadeAudioFiles",
+    "PipelineRunner"
     ]
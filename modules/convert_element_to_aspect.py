@@ -129,23 +129,12 @@ class ConvertElementToAspect:
         list
             List of mapped valence values.
         """
-        valence_array = []
-        element_data = self.data_all[element_name]
-
-        for val in element_data:
-            if val >= max_thresh:
-                valence_array.append(self.VALENCE_MAX)
-            elif val < min_thresh:
-                valence_array.append(self.VALENCE_MIN)
-            else:
-                valence_array.append(
-                    self.get_normalized_value(val, max_thresh, min_thresh,
-                                              self.VALENCE_MAX, self.VALENCE_MIN,
-                                              self.VALENCE_INTERVAL)
-                )
+        valence_array = self._map_to_scale(
+            self.data_all[element_name], min_thresh, max_thresh,
+            self.VALENCE_MAX, self.VALENCE_MIN, self.VALENCE_INTERVAL, isInverted
+        ).tolist()
 
         if isInverted:
-            valence_array = [val * (-1) for val in valence_array]
             print(f"'{element_name}' [{min_thresh}, {max_thresh}] is mapped to 'valence [-100, 100]' (inverted)")
         else:
             print(f"'{element_name}' [{min_thresh}, {max_thresh}] is mapped to 'valence [-100, 100]'")
@@ -173,29 +162,114 @@ class ConvertElementToAspect:
         list
             List of mapped arousal values.
         """
-        arousal_array = []
-        element_data = self.data_all[element_name]
-
-        for val in element_data:
-            if val >= max_thresh:
-                arousal_array.append(self.AROUSAL_MAX)
-            elif val < min_thresh:
-                arousal_array.append(self.AROUSAL_MIN)
-            else:
-                arousal_array.append(
-                    self.get_normalized_value(val, max_thresh, min_thresh,
-                                              self.AROUSAL_MAX, self.AROUSAL_MIN,
-                                              self.AROUSAL_INTERVAL)
-                )
+        arousal_array = self._map_to_scale(
+            self.data_all[element_name], min_thresh, max_thresh,
+            self.AROUSAL_MAX, self.AROUSAL_MIN, self.AROUSAL_INTERVAL, isInverted
+        ).tolist()
 
         if isInverted:
-            arousal_array = [val * (-1) for val in arousal_array]
             print(f"'{element_name}' [{max_thresh}, {min_thresh}] is mapped to 'arousal [0, 100]' (inverted)")
         else:
             print(f"'{element_name}' [{max_thresh}, {min_thresh}] is mapped to 'arousal [0, 100]'")
 
         return arousal_array
 
+    def convert_elements(self, element_names, aspect, min_thresh, max_thresh, isInverted=False):
+        """
+        Convert several columns at once into valence or arousal values.
+
+        All columns are clipped, normalized, rounded and (optionally) inverted
+        as whole NumPy arrays. The result is identical to calling
+        `convert_element_to_valence` / `convert_element_to_arousal` per column.
+
+        Parameters
+        ----------
+        element_names : list of str
+            Names of the columns to convert.
+        aspect : str
+            Target aspect, either "valence" or "arousal".
+        min_thresh : float, list or dict
+            Minimum threshold, either shared by all columns, one per column
+            (same order as `element_names`) or a dict keyed by column name.
+        max_thresh : float, list or dict
+            Maximum threshold, same formats as `min_thresh`.
+        isInverted : bool, list or dict, optional
+            Whether to invert the mapping (default: False).
+
+        Returns
+        -------
+        pd.DataFrame
+            Integer DataFrame with one column per element, sharing the index
+            of the input dataset.
+        """
+        if aspect == "valence":
+            new_max, new_min, intervals = self.VALENCE_MAX, self.VALENCE_MIN, self.VALENCE_INTERVAL
+        elif aspect == "arousal":
+            new_max, new_min, intervals = self.AROUSAL_MAX, self.AROUSAL_MIN, self.AROUSAL_INTERVAL
+        else:
+            raise ValueError(f"Unknown aspect: {aspect}. Use 'valence' or 'arousal'.")
+
+        element_names = list(element_names)
+        min_arr = self._broadcast_param(min_thresh, element_names, "min_thresh").astype(float)
+        max_arr = self._broadcast_param(max_thresh, element_names, "max_thresh").astype(float)
+        inv_arr = self._broadcast_param(isInverted, element_names, "isInverted").astype(bool)
+
+        mapped = self._map_to_scale(
+            self.data_all[element_names], min_arr, max_arr,
+            new_max, new_min, intervals, inv_arr
+        )
+        print(f"{len(element_names)} column(s) {element_names} mapped to '{aspect} [{new_min}, {new_max}]'")
+
+        return pd.DataFrame(mapped, index=self.data_all.index, columns=element_names)
+
+    @staticmethod
+    def _broadcast_param(param, element_names, param_name):
+        """
+        Expand a scalar, list or dict parameter into one value per column.
+        """
+        if isinstance(param, dict):
+            missing = [name for name in element_names if name not in param]
+            if missing:
+                raise ValueError(f"'{param_name}' has no value for columns: {missing}")
+            values = [param[name] for name in element_names]
+        elif np.ndim(param) == 0:
+            values = [param] * len(element_names)
+        else:
+            values = list(param)
+            if len(values) != len(element_names):
+                raise ValueError(f"Length of '{param_name}' does not match number of columns.")
+        return np.asarray(values)
+
+    @staticmethod
+    def _map_to_scale(values, min_thresh, max_thresh, new_max, new_min, intervals, isInverted):
+        """
+        Vectorized equivalent of the per-row threshold / normalize / round logic.
+
+        Values `>= max_thresh` map to `new_max`, values `< min_thresh` map to
+        `new_min`, everything else is normalized with the same arithmetic as
+        `get_normalized_value` and rounded half-to-even like Python's `round`.
+        Thresholds and `isInverted` may be scalars or per-column arrays.
+
+        Returns
+        -------
+        np.ndarray
+            int64 array with the same shape as `values`.
+        """
+        data = np.asarray(values, dtype=float)
+        if np.isnan(data).any():
+            raise ValueError("Cannot map NaN values to an emotional aspect.")
+
+        # thresholds may coincide; those rows are overwritten by the edge handling below
+        with np.errstate(divide="ignore", invalid="ignore"):
+            normalized = (data - min_thresh) / (max_thresh - min_thresh) * (new_max - new_min) + new_min
+            rounded = np.rint(normalized / intervals) * intervals
+
+        rounded = np.where(data < min_thresh, new_min, rounded)
+        rounded = np.where(data >= max_thresh, new_max, rounded)
+        result = rounded.astype(np.int64)
+
+        return np.where(isInverted, -result, result)
+
     # ========================================
     # Generate text-based prompts for each converted value pair
     # ========================================
@@ -10,8 +10,17 @@ from mido import Message, MidiFile, MidiTrack, MetaMessage, bpm2tempo
 import numpy as np
 from scipy.io.wavfile import write
 import os
-import random
+import json
 import time
+import hashlib
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+try:
+    from .utils import BandLimitedOscillator, AtomicFile
+except ImportError:
+    # run as a script: python modules/<this file>.py
+    from utils.band_limited_oscillator import BandLimitedOscillator
+    from utils.atomic_file import AtomicFile
 
 
 class CreateChordsAndMelody:
@@ -29,6 +38,12 @@ class CreateChordsAndMelody:
         Minimum note velocity for MIDI events.
     BASE_BPM : int
         Base tempo for the generated music (fixed).
+    NOTE_DURATION : float
+        Length in seconds of each synthesized note in WAV rendering.
+    NOTE_AMPLITUDE : float
+        Peak amplitude of each synthesized note before normalization.
+    RENDER_BATCH_NOTES : int
+        Number of notes mixed per vectorized batch in WAV rendering.
     sample_rate : int
         Audio sample rate for WAV file generation.
     output_dir : str
@@ -38,8 +53,20 @@ class CreateChordsAndMelody:
     BARS_TO_EACH_POINT = 4
     MIN_LOUDNESS = 50
     BASE_BPM = 60
-
-    def __init__(self, file_save_path: str = "./data/output/generated_melody/", sample_rate: int = 44100):
+    NOTE_DURATION = 0.5
+    NOTE_AMPLITUDE = 0.2
+    RENDER_BATCH_NOTES = 256
+    RENDER_CACHE_VERSION = 1
+    _MODESET = None
+
+    def __init__(
+        self,
+        file_save_path: str = "./data/output/generated_melody/",
+        sample_rate: int = 44100,
+        cache_dir: str = None,
+        waveform: str = "sine",
+        oscillator_method: str = "polyblep"
+    ):
         """
         Initialize the music generator.
 
@@ -49,13 +76,98 @@ class CreateChordsAndMelody:
             Base directory where generated MIDI/WAV files will be stored.
         sample_rate : int
             Audio sample rate for WAV files (default: 44100 Hz).
+        cache_dir : str, optional
+            Directory for the render cache. Rendered MIDI/WAV files are stored
+            under a key derived from (valence, arousal, seed) and the generator
+            parameters, and copied from there on later runs. Disabled when None.
+        waveform : str
+            Oscillator waveform for WAV rendering: "sine", "saw" or "square" (default: "sine").
+        oscillator_method : str
+            "polyblep" (band-limited) or "naive" for saw/square (default: "polyblep").
         """
         self.sample_rate = sample_rate
         timestamp = time.strftime("%Y%m%d_%H%M%S")
         self.output_dir = os.path.join(file_save_path, timestamp)
+        self.cache_dir = cache_dir
+        self.oscillator = BandLimitedOscillator(sample_rate, waveform, oscillator_method)
+        self._wavetable_cache = {}
+
 
+    @staticmethod
+    def create_modeset():
+        """
+        Create a predefined set of musical modes and associated chord structures.
 
-    def create_midi_and_wav(self, valence, arousal, idx) -> str:
+        Returns
+        -------
+        np.ndarray
+            A 3D array containing chord notes for multiple modes.
+        """
+        CHORD_LIST = np.array([
+            [60, 64, 55, 59],
+            [62, 65, 57, 60],
+            [64, 55, 59, 62],
+            [60, 65, 57, 64],
+            [55, 59, 62, 65],
+            [57, 60, 64, 55],
+            [59, 62, 65, 57]
+        ])
+
+        MODESET = np.zeros((4, CHORD_LIST.shape[1], CHORD_LIST.shape[0]))
+
+        # Lydian mode: Dreamy, ethereal
+        MODESET[0, :, 0] = CHORD_LIST[3, :]
+        MODESET[1, :, 0] = CHORD_LIST[6, :]
+        MODESET[2, :, 0] = CHORD_LIST[0, :]
+        MODESET[3, :, 0] = CHORD_LIST[3, :]
+
+        # Ionian mode: Bright, happy
+        MODESET[0, :, 1] = CHORD_LIST[0, :]
+        MODESET[1, :, 1] = CHORD_LIST[3, :]
+        MODESET[2, :, 1] = CHORD_LIST[4, :]
+        MODESET[3, :, 1] = CHORD_LIST[0, :]
+
+        # Mixolydian mode: Bold, bluesy
+        MODESET[0, :, 2] = CHORD_LIST[4, :]
+        MODESET[1, :, 2] = CHORD_LIST[0, :]
+        MODESET[2, :, 2] = CHORD_LIST[1, :]
+        MODESET[3, :, 2] = CHORD_LIST[4, :]
+
+        # Dorian mode: Cool, soulful
+        MODESET[0, :, 3] = CHORD_LIST[1, :]
+        MODESET[1, :, 3] = CHORD_LIST[4, :]
+        MODESET[2, :, 3] = CHORD_LIST[5, :]
+        MODESET[3, :, 3] = CHORD_LIST[1, :]
+
+        # Aeolian mode: Melancholic, reflective
+        MODESET[0, :, 4] = CHORD_LIST[5, :]
+        MODESET[1, :, 4] = CHORD_LIST[1, :]
+        MODESET[2, :, 4] = CHORD_LIST[2, :]
+        MODESET[3, :, 4] = CHORD_LIST[5, :]
+
+        # Phrygian mode: Dark, mysterious
+        MODESET[0, :, 5] = CHORD_LIST[2, :]
+        MODESET[1, :, 5] = CHORD_LIST[5, :]
+        MODESET[2, :, 5] = CHORD_LIST[6, :]
+        MODESET[3, :, 5] = CHORD_LIST[2, :]
+
+        # Locrian mode: Dissonant, eerie
+        MODESET[0, :, 6] = CHORD_LIST[6, :]
+        MODESET[1, :, 6] = CHORD_LIST[2, :]
+        MODESET[2, :, 6] = CHORD_LIST[3, :]
+        MODESET[3, :, 6] = CHORD_LIST[6, :]
+
+        print("modeset created")
+        return MODESET
+
+    @classmethod
+    def _get_modeset(cls) -> np.ndarray:
+        """Return the modeset, building it only on first use."""
+        if cls._MODESET is None:
+            cls._MODESET = cls.create_modeset()
+        return cls._MODESET
+
+    def create_midi_and_wav(self, valence, arousal, idx, seed: int = 0) -> str:
         """
         Generate MIDI sequences and WAV audio from valence and arousal arrays.
 
@@ -65,6 +177,10 @@ class CreateChordsAndMelody:
             Array of valence values (range [-100, 100]).
         arousal_array : list or np.ndarray
             Array of arousal values (range [0, 100]).
+        seed : int
+            Base seed. All random choices come from a generator seeded with
+            `point_seed(valence, arousal, seed)`, so the same inputs always
+            produce the same MIDI file (default: 0).
 
         Notes
         -----
@@ -72,74 +188,13 @@ class CreateChordsAndMelody:
         Music features such as mode, chord roughness, voicing, and loudness
         are influenced by normalized valence and arousal values.
         """
+        midi_path = self._midi_path(valence, arousal)
+        cache_key = self._render_key(valence, arousal, seed)
+        if self._restore_from_cache(cache_key, ".mid", midi_path):
+            return self.output_dir
 
-        def create_modeset():
-            """
-            Create a predefined set of musical modes and associated chord structures.
-
-            Returns
-            -------
-            np.ndarray
-                A 3D array containing chord notes for multiple modes.
-            """
-            CHORD_LIST = np.array([
-                [60, 64, 55, 59],
-                [62, 65, 57, 60],
-                [64, 55, 59, 62],
-                [60, 65, 57, 64],
-                [55, 59, 62, 65],
-                [57, 60, 64, 55],
-                [59, 62, 65, 57]
-            ])
-
-            MODESET = np.zeros((4, CHORD_LIST.shape[1], CHORD_LIST.shape[0]))
-
-            # Lydian mode: Dreamy, ethereal
-            MODESET[0, :, 0] = CHORD_LIST[3, :]
-            MODESET[1, :, 0] = CHORD_LIST[6, :]
-            MODESET[2, :, 0] = CHORD_LIST[0, :]
-            MODESET[3, :, 0] = CHORD_LIST[3, :]
-
-            # Ionian mode: Bright, happy
-            MODESET[0, :, 1] = CHORD_LIST[0, :]
-            MODESET[1, :, 1] = CHORD_LIST[3, :]
-            MODESET[2, :, 1] = CHORD_LIST[4, :]
-            MODESET[3, :, 1] = CHORD_LIST[0, :]
-
-            # Mixolydian mode: Bold, bluesy
-            MODESET[0, :, 2] = CHORD_LIST[4, :]
-            MODESET[1, :, 2] = CHORD_LIST[0, :]
-            MODESET[2, :, 2] = CHORD_LIST[1, :]
-            MODESET[3, :, 2] = CHORD_LIST[4, :]
-
-            # Dorian mode: Cool, soulful
-            MODESET[0, :, 3] = CHORD_LIST[1, :]
-            MODESET[1, :, 3] = CHORD_LIST[4, :]
-            MODESET[2, :, 3] = CHORD_LIST[5, :]
-            MODESET[3, :, 3] = CHORD_LIST[1, :]
-
-            # Aeolian mode: Melancholic, reflective
-            MODESET[0, :, 4] = CHORD_LIST[5, :]
-            MODESET[1, :, 4] = CHORD_LIST[1, :]
-            MODESET[2, :, 4] = CHORD_LIST[2, :]
-            MODESET[3, :, 4] = CHORD_LIST[5, :]
-
-            # Phrygian mode: Dark, mysterious
-            MODESET[0, :, 5] = CHORD_LIST[2, :]
-            MODESET[1, :, 5] = CHORD_LIST[5, :]
-            MODESET[2, :, 5] = CHORD_LIST[6, :]
-            MODESET[3, :, 5] = CHORD_LIST[2, :]
-
-            # Locrian mode: Dissonant, eerie
-            MODESET[0, :, 6] = CHORD_LIST[6, :]
-            MODESET[1, :, 6] = CHORD_LIST[2, :]
-            MODESET[2, :, 6] = CHORD_LIST[3, :]
-            MODESET[3, :, 6] = CHORD_LIST[6, :]
-
-            print("modeset created")
-            return MODESET
-
-        modeset = create_modeset()
+        modeset = self._get_modeset()
+        rng = np.random.default_rng(self.point_seed(valence, arousal, seed))
 
         # Generate MIDI and WAV for each valence-arousal data point
         mid = MidiFile()
@@ -163,24 +218,24 @@ class CreateChordsAndMelody:
 
         # Generate 4-bar loop per data point
         for seq in range(self.BARS_TO_EACH_POINT):
-            activate1 = np.where(np.random.rand(8) < roughness, 0, 1)
-            activate2 = np.where(np.random.rand(8) < roughness, 0, 1)
+            activate1 = np.where(rng.random(8) < roughness, 0, 1)
+            activate2 = np.where(rng.random(8) < roughness, 0, 1)
             bright = np.zeros(6)
             for i in range(6):
                 if voicing < 0.5:
-                    bright[i] = -1 if np.random.rand() > voicing * 2 else 0
+                    bright[i] = -1 if rng.random() > voicing * 2 else 0
                 else:
-                    bright[i] = 1 if np.random.rand() < (voicing - 0.5) * 2 else 0
+                    bright[i] = 1 if rng.random() < (voicing - 0.5) * 2 else 0
 
             # --- Generate chord notes --- #
             for i in range(3):
                 note = int(modeset[seq, i + 1, mode] + bright[i] * 12)
-                vel = random.randint(self.MIN_LOUDNESS, int(loudness))
+                vel = int(rng.integers(self.MIN_LOUDNESS, int(loudness), endpoint=True))
                 track.append(Message('note_on', channel=0, note=note, velocity=vel, time=0))
 
             # --- Generate bass notes --- #
             base_note = int(modeset[seq, 1, mode] - (12 if voicing > 0.5 else 24))
-            vel = random.randint(self.MIN_LOUDNESS, int(loudness))
+            vel = int(rng.integers(self.MIN_LOUDNESS, int(loudness), endpoint=True))
             track.append(Message('note_on', channel=0, note=base_note, velocity=vel, time=0))
 
             # --- Generate melody notes --- #
@@ -189,73 +244,253 @@ class CreateChordsAndMelody:
 
                 if activate1[tone] == 1:
                     note = int(modeset[seq, 1, mode] + bright[4] * 12)
-                    vel = random.randint(self.MIN_LOUDNESS, int(loudness))
+                    vel = int(rng.integers(self.MIN_LOUDNESS, int(loudness), endpoint=True))
                     track.append(Message('note_on', channel=0, note=note, velocity=vel, time=0))
                     track.append(Message('note_off', channel=0, note=note, velocity=vel, time=delay))
 
                 if activate2[tone] == 1:
-                    idx2 = np.random.randint(2, 4)
+                    idx2 = rng.integers(2, 4)
                     note = int(modeset[seq, idx2, mode] + bright[5] * 12)
-                    vel = random.randint(self.MIN_LOUDNESS, int(loudness))
+                    vel = int(rng.integers(self.MIN_LOUDNESS, int(loudness), endpoint=True))
                     track.append(Message('note_on', channel=0, note=note, velocity=vel, time=0))
                     track.append(Message('note_off', channel=0, note=note, velocity=vel, time=delay))
 
-            # --- Save MIDI file --- #
-            os.makedirs(self.output_dir, exist_ok=True)
-            file_name = f"melody_val{valence}_aro{arousal}.mid"
-            midi_path = os.path.join(self.output_dir, file_name)
-            mid.save(midi_path)
-            print(f"MIDI file saved: {midi_path}")
+        # --- Save MIDI file once all bars are written --- #
+        os.makedirs(self.output_dir, exist_ok=True)
+        mid.save(midi_path)
+        print(f"MIDI file saved: {midi_path}")
+        self._store_in_cache(cache_key, ".mid", midi_path)
         return self.output_dir
+
+    def _midi_path(self, valence, arousal) -> str:
+        return os.path.join(self.output_dir, f"melody_val{valence}_aro{arousal}.mid")
+
+    # --- Render cache --- #
+    def _render_key(self, valence, arousal, seed: int) -> str:
+        """Content address of a render: the point, its seed and every parameter that shapes the output."""
+        params = {
+            "valence": valence,
+            "arousal": arousal,
+            "seed": seed,
+            "bars": self.BARS_TO_EACH_POINT,
+            "min_loudness": self.MIN_LOUDNESS,
+            "bpm": self.BASE_BPM,
+            "note_duration": self.NOTE_DURATION,
+            "note_amplitude": self.NOTE_AMPLITUDE,
+            "sample_rate": self.sample_rate,
+            "waveform": self.oscillator.waveform,
+            "oscillator_method": self.oscillator.method,
+            "version": self.RENDER_CACHE_VERSION,
+        }
+        return hashlib.sha1(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _restore_from_cache(self, cache_key: str, suffix: str, dest_path: str) -> bool:
+        """Copy a cached render to `dest_path`. Returns False on a miss or when caching is disabled."""
+        if self.cache_dir is None:
+            return False
+        cached_path = os.path.join(self.cache_dir, cache_key + suffix)
+        if not os.path.exists(cached_path):
+            return False
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        AtomicFile.copy(cached_path, dest_path)
+        print(f"Loaded from cache: {dest_path}")
+        return True
+
+    def _store_in_cache(self, cache_key: str, suffix: str, src_path: str):
+        if self.cache_dir is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        AtomicFile.copy(src_path, os.path.join(self.cache_dir, cache_key + suffix))
     
     # --- Convert MIDI to WAV --- #
+    def _parse_note_events(self, mid):
+        """
+        Collect note-on events without real-time playback.
+
+        Returns
+        -------
+        (np.ndarray, np.ndarray, np.ndarray)
+            Start samples, end samples and MIDI note numbers (all int64) of every sounding note.
+        """
+        starts = []
+        notes = []
+        time_accum = 0.0
+        for msg in mid:
+            # Iterating a MidiFile yields delta times in seconds, as mid.play() does without sleeping
+            time_accum += msg.time
+            if msg.type == 'note_on' and msg.velocity > 0:
+                starts.append(time_accum)
+                notes.append(msg.note)
+
+        starts = np.asarray(starts, dtype=float)
+        start_samples = (starts * self.sample_rate).astype(np.int64)
+        end_samples = ((starts + self.NOTE_DURATION) * self.sample_rate).astype(np.int64)
+        return start_samples, end_samples, np.asarray(notes, dtype=np.int64)
+
+    def _wavetables(self, notes: np.ndarray) -> np.ndarray:
+        """
+        Return one precomputed wavetable per requested pitch, cached across calls.
+
+        Each table holds NOTE_DURATION seconds (+1 sample) of the note rendered by
+        `self.oscillator`; all missing pitches are rendered in one vectorized pass.
+        """
+        cache = self._wavetable_cache
+        length = int(self.NOTE_DURATION * self.sample_rate) + 1
+        missing = [n for n in np.unique(notes) if n not in cache]
+        if missing:
+            freqs = 440.0 * 2 ** ((np.asarray(missing) - 69) / 12.0)
+            tables = (self.NOTE_AMPLITUDE * self.oscillator.render(freqs, length)).astype(np.float32)
+            for note, table in zip(missing, tables):
+                cache[note] = table
+        return np.stack([cache[n] for n in notes]) if len(notes) else np.zeros((0, length), dtype=np.float32)
+
+    def render_midi(self, midi_path) -> np.ndarray:
+        """
+        Render a MIDI file offline with the configured oscillator (sine by default).
+
+        Notes are parsed into event arrays and mixed in one vectorized pass
+        from per-pitch wavetables into a preallocated float32 buffer.
+
+        Returns
+        -------
+        np.ndarray
+            Unnormalized float32 audio, `mid.length` seconds long.
+        """
+        mid = MidiFile(midi_path)
+        audio = np.zeros(int(mid.length * self.sample_rate), dtype=np.float32)
+
+        start_samples, end_samples, notes = self._parse_note_events(mid)
+        end_samples = np.minimum(end_samples, len(audio))
+        offsets = np.arange(int(self.NOTE_DURATION * self.sample_rate) + 1)
+
+        # Bounded batches keep the (notes x samples) index matrix small for long files
+        for i in range(0, len(notes), self.RENDER_BATCH_NOTES):
+            batch = slice(i, i + self.RENDER_BATCH_NOTES)
+            tables = self._wavetables(notes[batch])
+            positions = start_samples[batch, None] + offsets[None, :]
+            # Keep only samples inside the note and the buffer
+            mask = positions < end_samples[batch, None]
+            np.add.at(audio, positions[mask], tables[mask])
+        return audio
+
     def midi_to_wav(self, midi_path, valence, arousal, idx):
         """
-        Convert a MIDI file into a WAV file using simple sine wave synthesis.
+        Convert a MIDI file into a WAV file using the configured oscillator (sine by default).
 
         Parameters
         ----------
         midi_path : str
             Path to the MIDI file to convert.
         """
-        mid = MidiFile(midi_path)
-        time_accum = 0.0
-        audio = np.zeros(int(mid.length * self.sample_rate))
-
-        for msg in mid.play():
-            time_accum += msg.time
-            if msg.type == 'note_on' and msg.velocity > 0:
-                duration = 0.5
-                start_sample = int(time_accum * self.sample_rate)
-                end_sample = int((time_accum + duration) * self.sample_rate)
-                if end_sample > len(audio):
-                    end_sample = len(audio)
-                wave_duration = end_sample - start_sample
-                t = np.linspace(0, duration, wave_duration, False)
-                freq = 440.0 * 2 ** ((msg.note - 69) / 12.0)
-                wave = 0.2 * np.sin(2 * np.pi * freq * t)
-                if len(wave) < wave_duration:
-                    wave = np.pad(wave, (0, wave_duration - len(wave)))
-                audio[start_sample:end_sample] += wave
+        audio = self.render_midi(midi_path)
 
         # Normalize and save
-        audio = np.int16(audio / np.max(np.abs(audio)) * 32767)
+        peak = np.max(np.abs(audio)) if audio.size else 0.0
+        if peak > 0:
+            audio = audio / peak * 32767
+        audio = np.int16(audio)
         wave_path = os.path.join(
             self.output_dir,
             f"melody_val{valence}_aro{arousal}.wav"
         )
         write(wave_path, self.sample_rate, audio)
         print(f"WAV file saved as {wave_path}")
+        return wave_path
+
+    # --- Batch generation --- #
+    @staticmethod
+    def point_seed(valence, arousal, seed: int = 0) -> int:
+        """Deterministic per-point seed, independent of the order points are processed in."""
+        key = zlib.crc32(f"{valence}_{arousal}".encode())
+        return int(np.random.SeedSequence([seed, key]).generate_state(1)[0])
+
+    def _generate_point(self, valence, arousal, seed: int, render_wav: bool) -> dict:
+        """Generate the MIDI (and optionally WAV) file for one point, reusing cached renders."""
+        self.create_midi_and_wav(valence, arousal, 0, seed=seed)
+        midi_path = self._midi_path(valence, arousal)
+        wav_path = None
+        if render_wav:
+            wav_path = os.path.splitext(midi_path)[0] + ".wav"
+            cache_key = self._render_key(valence, arousal, seed)
+            if not self._restore_from_cache(cache_key, ".wav", wav_path):
+                wav_path = self.midi_to_wav(midi_path, valence, arousal, 0)
+                self._store_in_cache(cache_key, ".wav", wav_path)
+        return {
+            "valence": valence,
+            "arousal": arousal,
+            "seed": seed,
+            "point_seed": self.point_seed(valence, arousal, seed),
+            "midi_path": midi_path,
+            "wav_path": wav_path,
+        }
+
+    def create_batch(self, points, seed: int = 0, render_wav: bool = True, max_workers: int = None) -> list:
+        """
+        Generate MIDI (and WAV) files for many valence-arousal points in parallel.
+
+        Parameters
+        ----------
+        points : list of (valence, arousal)
+            Points to generate, e.g. the full 21x21 grid.
+        seed : int
+            Base seed. Each point gets `point_seed(valence, arousal, seed)`, so
+            results do not depend on worker count or scheduling (default: 0).
+        render_wav : bool
+            Also render a WAV file for every MIDI file (default: True).
+        max_workers : int, optional
+            Number of worker processes (default: os.cpu_count()). 1 runs serially in-process.
+
+        Returns
+        -------
+        list of dict
+            Manifest with valence, arousal, seed, point_seed, midi_path and wav_path per point,
+            in the order of `points`. Also saved as manifest.json in `output_dir`.
+        """
+        points = [(valence, arousal) for valence, arousal in points]
+        tasks = [(valence, arousal, seed, render_wav) for valence, arousal in points]
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(tasks) or 1))
+        if max_workers == 1:
+            manifest = [self._generate_point(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_batch_worker,
+                initargs=(self.output_dir, self.sample_rate, self.cache_dir, self.oscillator.waveform, self.oscillator.method)
+            ) as executor:
+                manifest = list(executor.map(_run_batch_task, tasks, chunksize=max(1, len(tasks) // (4 * max_workers))))
+
+        manifest_path = os.path.join(self.output_dir, "manifest.json")
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        print(f"Manifest saved: {manifest_path} ({len(manifest)} points)")
+        return manifest
+
+
+# One generator per worker process, so the modeset and wavetables are built once per worker
+_BATCH_GENERATOR = None
+
+
+def _init_batch_worker(output_dir: str, sample_rate: int, cache_dir: str, waveform: str, oscillator_method: str):
+    global _BATCH_GENERATOR
+    _BATCH_GENERATOR = CreateChordsAndMelody(
+        sample_rate=sample_rate,
+        cache_dir=cache_dir,
+        waveform=waveform,
+        oscillator_method=oscillator_method
+    )
+    _BATCH_GENERATOR.output_dir = output_dir
+    _BATCH_GENERATOR._get_modeset()
+
 
+def _run_batch_task(task) -> dict:
+    return _BATCH_GENERATOR._generate_point(*task)
 
 
 if __name__ == "__main__":
     valence_array = [-100, -90, -80, -70, -60, -50, -40, -30, -20, -10, 0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100]
     arousal_array = [0, 5, 10, 15, 20, 25, 30, 35, 40, 45, 50, 55, 60, 65, 70, 75, 80, 85, 90, 95, 100]
     c = CreateChordsAndMelody()
-    idx = 1
-    for v in range(len(valence_array)):
-        for a in range(len(arousal_array)):
-            c.create_midi_and_wav(valence_array[v], arousal_array[a], idx)
-            idx += 1
-    
\ No newline at end of file
+    points = [(v, a) for v in valence_array for a in arousal_array]
+    c.create_batch(points)
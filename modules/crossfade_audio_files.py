@@ -1,7 +1,19 @@
 import os
+import hashlib
+import subprocess
+import numpy as np
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from pydub import AudioSegment
+try:
+    from .utils import AtomicFile
+except ImportError:
+    # run as a script: python modules/<this file>.py
+    from utils.atomic_file import AtomicFile
 
 class CrossfadeAudioFiles:
+    FADE_CURVES = ("linear", "equal_power", "logarithmic", "s_curve")
+
     @staticmethod
     def crossfade_audio_files(
         input_path: str = "./data/output/generated_music_suno/",
@@ -45,8 +57,372 @@ class CrossfadeAudioFiles:
         combined.export(output_path, format="mp3")
         print(f"Crossfaded mp3 file saved to: {output_path}")
 
+    # ========================================
+    # Streaming mixer
+    # ========================================
+
+    @staticmethod
+    def _decode_pcm(path: str, sample_rate: int, channels: int, duration_ms: int = None) -> np.ndarray:
+        """
+        Decode an audio file with ffmpeg into float32 frames of shape (n_frames, channels).
+        Only the first `duration_ms` milliseconds are decoded when given.
+        """
+        cmd = [AudioSegment.converter, "-v", "error", "-i", path]
+        if duration_ms is not None:
+            cmd += ["-t", f"{duration_ms / 1000:.3f}"]
+        cmd += ["-f", "f32le", "-acodec", "pcm_f32le", "-ac", str(channels), "-ar", str(sample_rate), "-"]
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed to decode {path}: {result.stderr.decode(errors='replace')}")
+        return np.frombuffer(result.stdout, dtype=np.float32).reshape(-1, channels)
+
+    # ========================================
+    # Decoded PCM cache
+    # ========================================
+
+    @staticmethod
+    def _pcm_cache_path(path: str, cache_dir: str, sample_rate: int, channels: int) -> str:
+        """Cache entry for a file's decoded PCM, keyed by its content hash and decode format."""
+        digest = hashlib.sha1()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return os.path.join(cache_dir, f"{digest.hexdigest()}_{sample_rate}hz_{channels}ch.npy")
+
+    @staticmethod
+    def _load_pcm(path: str, sample_rate: int, channels: int, cache_dir: str = None, duration_ms: int = None) -> np.ndarray:
+        """
+        Return decoded float32 frames, memory-mapped from `cache_dir` when possible.
+
+        Cache entries always hold the whole file, so they can be reused for any
+        `duration_ms`; without a cache only the first `duration_ms` is decoded.
+        """
+        if cache_dir is None:
+            return CrossfadeAudioFiles._decode_pcm(path, sample_rate, channels, duration_ms=duration_ms)
+
+        cache_path = CrossfadeAudioFiles._pcm_cache_path(path, cache_dir, sample_rate, channels)
+        if not os.path.exists(cache_path):
+            pcm = CrossfadeAudioFiles._decode_pcm(path, sample_rate, channels)
+            os.makedirs(cache_dir, exist_ok=True)
+
+            def save(tmp_path):
+                # a file object, so np.save does not append ".npy" to the name
+                with open(tmp_path, "wb") as f:
+                    np.save(f, pcm)
+
+            AtomicFile.write(cache_path, save)
+        return np.load(cache_path, mmap_mode="r")
+
+    @staticmethod
+    def prefetch_pcm(paths, cache_dir: str, sample_rate: int = 44100, channels: int = 2, max_workers: int = 4):
+        """
+        Decode every uncached file in `paths` into `cache_dir` in parallel.
+        ffmpeg runs as a subprocess, so threads decode concurrently.
+        """
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            list(executor.map(
+                lambda path: CrossfadeAudioFiles._load_pcm(path, sample_rate, channels, cache_dir),
+                paths
+            ))
+
+    @staticmethod
+    def _open_encoder(output_path: str, sample_rate: int, channels: int, format: str = "mp3") -> subprocess.Popen:
+        """Start an ffmpeg process that encodes float32 frames written to its stdin."""
+        cmd = [
+            AudioSegment.converter, "-y", "-v", "error",
+            "-f", "f32le", "-ac", str(channels), "-ar", str(sample_rate), "-i", "-",
+            "-f", format, output_path,
+        ]
+        return subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    # ========================================
+    # NumPy crossfade engine
+    # ========================================
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _fade_curves(n_frames: int, curve: str = "linear"):
+        """
+        Fade-out and fade-in gain tables of shape (n_frames, 1), cached per (length, curve).
+
+        - linear      : linear amplitude, as pydub's crossfade
+        - equal_power : sin/cos gains, constant power for uncorrelated clips
+        - logarithmic : gain linear in dB, -60 dB to -3 dB over the first half and
+                        -3 dB to 0 dB over the second; the fade-out mirrors it, so
+                        both are at -3 dB (constant power) at the midpoint
+        - s_curve     : raised-cosine gain, slow at both ends
+        """
+        x = np.arange(n_frames, dtype=np.float64) / max(n_frames, 1)
+        if curve == "linear":
+            fade_in = x
+            fade_out = 1.0 - x
+        elif curve == "equal_power":
+            fade_in = np.sin(0.5 * np.pi * x)
+            fade_out = np.cos(0.5 * np.pi * x)
+        elif curve == "logarithmic":
+            ramp_db = ([0.0, 0.5, 1.0], [-60.0, -3.0, 0.0])
+            fade_in = np.where(x > 0, 10.0 ** (np.interp(x, *ramp_db) / 20.0), 0.0)
+            fade_out = 10.0 ** (np.interp(1.0 - x, *ramp_db) / 20.0)
+        elif curve == "s_curve":
+            fade_in = 0.5 - 0.5 * np.cos(np.pi * x)
+            fade_out = 1.0 - fade_in
+        else:
+            raise ValueError(f"Unknown fade curve '{curve}'. Choose from {CrossfadeAudioFiles.FADE_CURVES}.")
+
+        fade_out = fade_out.astype(np.float32)[:, None]
+        fade_in = fade_in.astype(np.float32)[:, None]
+        # Shared between calls through the cache, so never modify in place
+        fade_out.flags.writeable = False
+        fade_in.flags.writeable = False
+        return fade_out, fade_in
+
+    @staticmethod
+    def _estimate_beats(pcm: np.ndarray, sample_rate: int, hop: int = 512):
+        """
+        Estimate the beat period and the first beat of a clip from its onset envelope.
+
+        Returns
+        -------
+        (int, int) or None
+            Beat period and offset of the first beat, in frames. None if no tempo
+            between 60 and 180 BPM stands out.
+        """
+        mono = np.asarray(pcm, dtype=np.float32).mean(axis=1)
+        n_hops = len(mono) // hop
+        min_lag = int(60 * sample_rate / (180 * hop))
+        max_lag = int(np.ceil(60 * sample_rate / (60 * hop)))
+        if n_hops < 2 * max_lag:
+            return None
+
+        energy = np.sqrt(np.mean(mono[:n_hops * hop].reshape(n_hops, hop) ** 2, axis=1))
+        onset = np.maximum(np.diff(np.log(energy + 1e-6)), 0.0)
+        onset -= onset.mean()
+
+        spectrum = np.fft.rfft(onset, 2 * len(onset))
+        autocorr = np.fft.irfft(spectrum * np.conj(spectrum))[:len(onset)]
+        if autocorr[0] <= 0:
+            return None
+        lag = min_lag + int(np.argmax(autocorr[min_lag:max_lag + 1]))
+
+        usable = (len(onset) // lag) * lag
+        phase = int(np.argmax(onset[:usable].reshape(-1, lag).sum(axis=0)))
+        return lag * hop, (phase + 1) * hop
+
+    @staticmethod
+    def _mix_frames(sample_rate: int, crossfade_duration_ms: int, clip_total_length_ms: int):
+        """Validate the durations and return (clip_frames, fade_frames)."""
+        trim_tail_ms = clip_total_length_ms - crossfade_duration_ms
+        if trim_tail_ms <= 0:
+            raise ValueError("clip_total_length_ms must be larger than crossfade_duration_ms.")
+        clip_frames = int(trim_tail_ms * sample_rate / 1000)
+        fade_frames = int(crossfade_duration_ms * sample_rate / 1000)
+        if fade_frames > clip_frames:
+            raise ValueError("crossfade_duration_ms is longer than a trimmed clip.")
+        return clip_frames, fade_frames
+
+    @staticmethod
+    def _clip_segment(name: str, pcm: np.ndarray, clip_frames: int, fade_frames: int, beat_align: bool, sample_rate: int):
+        """
+        Cut the part of a clip that goes into the mix: `clip_frames` from the start,
+        or, with `beat_align`, from its first beat with the fade-out starting on a beat.
+        """
+        if beat_align:
+            # Only the part that can end up in the mix is analysed
+            beats = CrossfadeAudioFiles._estimate_beats(pcm[:clip_frames + 2 * sample_rate], sample_rate)
+            if beats is not None:
+                period, first_beat = beats
+                body = max(1, round((clip_frames - fade_frames) / period)) * period
+                if first_beat + body + fade_frames <= len(pcm):
+                    return np.array(pcm[first_beat:first_beat + body + fade_frames], dtype=np.float32)
+            print(f"No usable beat grid for {name}; using the unaligned cut.")
+
+        if len(pcm) < clip_frames:
+            raise ValueError(f"File too short to trim: {name}")
+        return np.array(pcm[:clip_frames], dtype=np.float32)
+
+    @staticmethod
+    def _iter_mix(clips, clip_frames: int, fade_frames: int, curve: str, beat_align: bool, sample_rate: int):
+        """
+        Yield consecutive blocks of the crossfaded mix for an iterable of (name, pcm).
+        Only the held-back tail of the previous clip is kept between clips.
+        """
+        fade_out, fade_in = CrossfadeAudioFiles._fade_curves(fade_frames, curve)
+        tail = None
+        for name, pcm in clips:
+            segment = CrossfadeAudioFiles._clip_segment(name, pcm, clip_frames, fade_frames, beat_align, sample_rate)
+            if tail is not None:
+                head = segment[:fade_frames]
+                head *= fade_in
+                head += tail * fade_out
+
+            # Hold back the tail for the next crossfade; emit the rest now
+            yield segment[:len(segment) - fade_frames]
+            tail = segment[len(segment) - fade_frames:]
+
+        if tail is not None:
+            yield tail
+
+    @staticmethod
+    def crossfade_pcm(
+        clips,
+        sample_rate: int = 44100,
+        crossfade_duration_ms: int = 5000,
+        clip_total_length_ms: int = 30000,
+        curve: str = "equal_power",
+        beat_align: bool = False
+    ) -> np.ndarray:
+        """
+        Crossfade already decoded clips in memory.
+
+        Parameters
+        ----------
+        clips : list of np.ndarray
+            float32 frames of shape (n_frames, channels), e.g. from `_load_pcm`.
+        curve : str
+            One of `FADE_CURVES` (default: "equal_power").
+        beat_align : bool
+            Start each clip on its first detected beat and begin its fade-out on a
+            beat, so consecutive clips cross on the beat (default: False).
+
+        Returns
+        -------
+        np.ndarray
+            float32 frames of the whole mix.
+        """
+        clip_frames, fade_frames = CrossfadeAudioFiles._mix_frames(sample_rate, crossfade_duration_ms, clip_total_length_ms)
+        named = ((f"clip {i}", pcm) for i, pcm in enumerate(clips))
+        blocks = list(CrossfadeAudioFiles._iter_mix(named, clip_frames, fade_frames, curve, beat_align, sample_rate))
+        return np.concatenate(blocks) if blocks else np.zeros((0, 2), dtype=np.float32)
+
+    @staticmethod
+    def crossfade_files(
+        paths,
+        output_path: str,
+        crossfade_duration_ms: int = 5000,
+        clip_total_length_ms: int = 30000,
+        sample_rate: int = 44100,
+        channels: int = 2,
+        cache_dir: str = None,
+        max_workers: int = 4,
+        curve: str = "equal_power",
+        beat_align: bool = False
+    ) -> str:
+        """
+        Crossfade the given mp3 files, in the given order, with bounded memory.
+
+        Each clip is decoded into a NumPy array, its head is blended with the
+        tail carried over from the previous clip, and everything up to its own
+        tail is written straight to an ffmpeg encoder. Memory holds one clip
+        plus one crossfade window regardless of how many clips are mixed, and
+        every sample is copied once. The encoder writes to a temporary file that
+        replaces `output_path` only once encoding succeeded.
+
+        With `cache_dir`, decoded PCM is stored as memory-mapped `.npy` files keyed
+        by file hash, sample rate and channels. Missing entries are decoded by
+        `max_workers` threads up front, so re-mixing with other durations skips
+        decoding entirely.
+
+        `curve` and `beat_align` are described in `crossfade_pcm`. Use
+        curve="linear" to reproduce pydub's crossfade.
+
+        Parameters
+        ----------
+        paths : list of str
+            Clips in playback order.
+        output_path : str
+            Path of the mp3 file to write.
+
+        Returns
+        -------
+        str
+            `output_path`.
+        """
+        paths = list(paths)
+        print(f"files: {[os.path.basename(path) for path in paths]}")
+
+        if len(paths) < 2:
+            raise ValueError("At least 2 files is needed.")
+
+        clip_frames, fade_frames = CrossfadeAudioFiles._mix_frames(sample_rate, crossfade_duration_ms, clip_total_length_ms)
+        if curve not in CrossfadeAudioFiles.FADE_CURVES:
+            raise ValueError(f"Unknown fade curve '{curve}'. Choose from {CrossfadeAudioFiles.FADE_CURVES}.")
+        # Beat alignment may start a clip up to one beat (<= 1 s at 60 BPM) late
+        decode_ms = clip_total_length_ms - crossfade_duration_ms + (2000 if beat_align else 0)
+
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+
+        if cache_dir is not None:
+            CrossfadeAudioFiles.prefetch_pcm(paths, cache_dir, sample_rate, channels, max_workers)
+
+        clips = (
+            (os.path.basename(path), CrossfadeAudioFiles._load_pcm(path, sample_rate, channels, cache_dir, duration_ms=decode_ms))
+            for path in paths
+        )
+
+        def encode(tmp_path):
+            encoder = CrossfadeAudioFiles._open_encoder(tmp_path, sample_rate, channels)
+            try:
+                for block in CrossfadeAudioFiles._iter_mix(clips, clip_frames, fade_frames, curve, beat_align, sample_rate):
+                    encoder.stdin.write(block.tobytes())
+                encoder.stdin.close()
+                if encoder.wait() != 0:
+                    raise RuntimeError(f"ffmpeg failed to encode {output_path}: {encoder.stderr.read().decode(errors='replace')}")
+            except BaseException:
+                encoder.kill()
+                encoder.wait()
+                raise
+
+        # A decode error or a too-short clip midway leaves any previous output untouched
+        AtomicFile.write(output_path, encode)
+
+        print(f"Crossfaded mp3 file saved to: {output_path}")
+        return output_path
+
+    @staticmethod
+    def crossfade_audio_files_streaming(
+        input_path: str = "./data/output/generated_music_suno/",
+        crossfade_duration_ms: int = 5000,
+        clip_total_length_ms: int = 30000,
+        output_path: str = None,
+        sample_rate: int = 44100,
+        channels: int = 2,
+        cache_dir: str = None,
+        max_workers: int = 4,
+        curve: str = "equal_power",
+        beat_align: bool = False
+    ) -> str:
+        """
+        Crossfade every mp3 in `input_path`, sorted by name, like `crossfade_audio_files`.
+
+        See `crossfade_files` for the mixing itself; use it directly to mix an
+        explicit list of files in a chosen order.
+
+        Returns
+        -------
+        str
+            Path of the written file (default: <input_path>/crossfade/crossfade.mp3).
+        """
+        files = sorted([f for f in os.listdir(input_path) if f.lower().endswith(".mp3")])
+        if output_path is None:
+            output_path = os.path.join(input_path, "crossfade/crossfade.mp3")
+
+        return CrossfadeAudioFiles.crossfade_files(
+            [os.path.join(input_path, file) for file in files],
+            output_path,
+            crossfade_duration_ms=crossfade_duration_ms,
+            clip_total_length_ms=clip_total_length_ms,
+            sample_rate=sample_rate,
+            channels=channels,
+            cache_dir=cache_dir,
+            max_workers=max_workers,
+            curve=curve,
+            beat_align=beat_align
+        )
 
 if __name__ == "__main__":
    for i in range(10, 11): 
         fader = CrossfadeAudioFiles()
-        fader.crossfade_audio_files(input_path=f"./data/output/generated_music_suno/stimuli{i}")
+        fader.crossfade_audio_files_streaming(
+            input_path=f"./data/output/generated_music_suno/stimuli{i}",
+            cache_dir="./data/cache/pcm/"
+        )
@@ -1,5 +1,8 @@
 import pandas as pd
 import requests
+from .utils import HttpSession, AtomicFile
+import hashlib
+import glob
 import io
 import os
 
@@ -11,8 +14,33 @@ class DataLoader:
     Loads a CSV or JSON file from a local file path or an online source (URL),
     and returns the data as a formatted pandas DataFrame.
     When loading a JSON file, a CSV copy is also saved to ../data/output/.
+
+    If `cache_dir` is given, every parsed source is also stored as an
+    uncompressed Arrow (Feather v2) file with its timestamp columns already
+    converted to datetime. Later loads memory-map that file instead of parsing
+    the source again. Cache entries are keyed by the source and its version
+    (mtime and size for local files, ETag or Last-Modified for URLs), so a
+    changed source invalidates its cache entry automatically.
     """
 
+    TIMESTAMP_KEYWORDS = ("time", "date", "captured_at", "created_at", "updated_at")
+
+    def __init__(self, cache_dir: str = None, timestamp_columns: list = None, session: HttpSession = None):
+        """
+        Parameters
+        ----------
+        cache_dir : str, optional
+            Directory for the columnar cache. Caching is disabled when None.
+        timestamp_columns : list of str, optional
+            Columns to parse as datetime. When None, columns whose name contains
+            one of `TIMESTAMP_KEYWORDS` are parsed if they convert cleanly.
+        session : HttpSession, optional
+            Transport for URL sources (default: the shared `HttpSession`).
+        """
+        self.cache_dir = cache_dir
+        self.timestamp_columns = timestamp_columns
+        self.session = session or HttpSession.shared()
+
     def load(self, source: str) -> pd.DataFrame:
         """
         Load data from a local file path or online source.
@@ -27,11 +55,29 @@ class DataLoader:
         pd.DataFrame
             A pandas DataFrame containing the loaded data.
         """
+        if self.cache_dir is None:
+            return self._read_source(source)
+
+        cache_path = self._cache_path(source)
+        if cache_path is not None and os.path.exists(cache_path):
+            from pyarrow import feather
+            print(f"Loaded from cache: {cache_path}")
+            return feather.read_table(cache_path, memory_map=True).to_pandas()
+
+        df = self._parse_timestamps(self._read_source(source))
+        if cache_path is not None:
+            self._write_cache(df, cache_path)
+        return df
+
+    def _read_source(self, source: str) -> pd.DataFrame:
+        """
+        Parse the source from scratch.
+        """
         source_lower = source.lower()
 
         # --- Load from URL ---
         if source_lower.startswith("https://") or source_lower.startswith("http://"):
-            response = requests.get(source)
+            response = self.session.get(source)
             response.raise_for_status()
 
             if ".csv" in source_lower:
@@ -69,3 +115,148 @@ class DataLoader:
         os.makedirs(output_dir, exist_ok=True)
         output_path = os.path.join(output_dir, "json_decoded.csv")
         df.to_csv(output_path, index=False, encoding="utf-8")
+
+    # ========================================
+    # Streaming chunked loading
+    # ========================================
+
+    def iter_chunks(self, source: str, chunksize: int = 100000, columns: list = None, lines: bool = None):
+        """
+        Yield the source as a sequence of DataFrame chunks with bounded memory.
+
+        Local files are read incrementally, and URLs are streamed from the
+        response body without buffering it whole. CSV and line-delimited JSON
+        (`.jsonl` / `.ndjson`, or `lines=True`) are streamed chunk by chunk;
+        a regular JSON document cannot be split and is parsed whole before
+        being sliced into chunks.
+
+        Parameters
+        ----------
+        source : str
+            Path to the local file or URL of the data source.
+        chunksize : int
+            Number of rows per chunk (default: 100000).
+        columns : list of str, optional
+            Only these columns are returned (all columns when None).
+        lines : bool, optional
+            Treat a JSON source as line-delimited. Inferred from the extension when None.
+
+        Yields
+        ------
+        pd.DataFrame
+            Consecutive chunks of the source with a continuous RangeIndex.
+        """
+        source_lower = source.lower()
+        is_url = source_lower.startswith("https://") or source_lower.startswith("http://")
+        path_lower = source_lower.split("?")[0] if is_url else source_lower
+
+        if path_lower.endswith(".csv"):
+            file_format = "csv"
+        elif path_lower.endswith((".jsonl", ".ndjson")):
+            file_format = "json"
+            lines = True if lines is None else lines
+        elif path_lower.endswith(".json"):
+            file_format = "json"
+        else:
+            raise ValueError("Unsupported file format. Only CSV or JSON are allowed.")
+
+        if is_url:
+            response = self.session.get(source, stream=True)
+            response.raise_for_status()
+            response.raw.decode_content = True
+            response.raw.auto_close = False
+            handle = io.TextIOWrapper(response.raw, encoding=response.encoding or "utf-8")
+        else:
+            if not os.path.exists(source):
+                raise FileNotFoundError(f"File not found: {source}")
+            handle = open(source, "r", encoding="utf-8")
+
+        with handle:
+            if file_format == "csv":
+                reader = pd.read_csv(handle, chunksize=chunksize, usecols=columns)
+            elif lines:
+                reader = pd.read_json(handle, lines=True, chunksize=chunksize)
+            else:
+                print("JSON source is not line-delimited; parsing it whole before chunking.")
+                df = pd.read_json(handle)
+                reader = (df.iloc[i:i + chunksize] for i in range(0, len(df), chunksize))
+
+            with_projection = file_format == "json" and columns is not None
+            for chunk in reader:
+                if with_projection:
+                    chunk = chunk[columns]
+                yield chunk
+
+    # ========================================
+    # Columnar cache
+    # ========================================
+
+    def _source_version(self, source: str):
+        """
+        Return a string identifying the current version of the source,
+        or None if it cannot be determined (the source is then not cached).
+        """
+        source_lower = source.lower()
+        if source_lower.startswith("https://") or source_lower.startswith("http://"):
+            try:
+                response = self.session.head(source, allow_redirects=True, timeout=10)
+            except requests.RequestException:
+                return None
+            version = response.headers.get("ETag") or response.headers.get("Last-Modified")
+            if version is None:
+                print(f"No ETag/Last-Modified for {source}; cache disabled for this source.")
+            return version
+
+        if not os.path.exists(source):
+            raise FileNotFoundError(f"File not found: {source}")
+        stat = os.stat(source)
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+    def _cache_path(self, source: str):
+        version = self._source_version(source)
+        if version is None:
+            return None
+        source_key = os.path.abspath(source) if os.path.exists(source) else source
+        source_hash = hashlib.sha1(source_key.encode("utf-8")).hexdigest()[:16]
+        version_hash = hashlib.sha1(version.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{source_hash}-{version_hash}.arrow")
+
+    def _write_cache(self, df: pd.DataFrame, cache_path: str):
+        """
+        Write the DataFrame as an uncompressed Arrow file and drop stale
+        entries of the same source.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        source_prefix = os.path.basename(cache_path).split("-")[0]
+        try:
+            AtomicFile.write(cache_path, lambda tmp_path: df.reset_index(drop=True).to_feather(tmp_path, compression="uncompressed"))
+        except (ValueError, TypeError) as e:
+            # e.g. mixed-type object columns that Arrow cannot represent
+            print(f"Could not cache {cache_path}: {e}")
+            return
+
+        for stale in glob.glob(os.path.join(self.cache_dir, f"{source_prefix}-*.arrow")):
+            if stale != cache_path:
+                os.remove(stale)
+        print(f"Cached as: {cache_path}")
+
+    def _parse_timestamps(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convert timestamp columns to datetime so cached files keep the parsed dtype.
+        """
+        if self.timestamp_columns is not None:
+            columns = [c for c in self.timestamp_columns if c in df.columns]
+        else:
+            columns = [
+                c for c in df.columns
+                if (pd.api.types.is_object_dtype(df[c]) or pd.api.types.is_string_dtype(df[c]))
+                and any(k in str(c).lower() for k in self.TIMESTAMP_KEYWORDS)
+            ]
+
+        for col in columns:
+            try:
+                df[col] = pd.to_datetime(df[col])
+            except (ValueError, TypeError):
+                if self.timestamp_columns is not None:
+                    raise
+        return df
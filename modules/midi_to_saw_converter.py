@@ -1,9 +1,20 @@
 import os
+import json
+import hashlib
 import numpy as np
 from mido import MidiFile
 from scipy.io.wavfile import write
+from concurrent.futures import ProcessPoolExecutor
+try:
+    from .utils import BandLimitedOscillator, AtomicFile
+except ImportError:
+    # run as a script: python modules/<this file>.py
+    from utils.band_limited_oscillator import BandLimitedOscillator
+    from utils.atomic_file import AtomicFile
 
 class MidiToSawWavConverter:
+    MANIFEST_NAME = ".render_manifest.json"
+
     def __init__(
         self,
         input_folder: str,
@@ -11,7 +22,8 @@ class MidiToSawWavConverter:
         sample_rate: int = 44100,
         decay: float = 0.2,
         release: float = 0.3,
-        min_duration: float = 8.0
+        min_duration: float = 8.0,
+        oscillator_method: str = "polyblep"
     ):
         self.input_folder = input_folder
         self.output_folder = output_folder
@@ -19,15 +31,19 @@ class MidiToSawWavConverter:
         self.decay = decay
         self.release = release
         self.min_duration = min_duration
+        self.oscillator_method = oscillator_method
+        self._tone_cache = {}
 
         os.makedirs(self.output_folder, exist_ok=True)
 
     def _saw_wave(self, frequency, duration):
-        t = np.linspace(0, duration, int(self.sample_rate * duration), endpoint=False)
-        return 2 * (t * frequency - np.floor(0.5 + t * frequency))
+        """Saw wave(s) of `duration` seconds; one row per frequency when given an array."""
+        oscillator = BandLimitedOscillator(self.sample_rate, "saw", self.oscillator_method)
+        wave = oscillator.render(frequency, int(self.sample_rate * duration))
+        return wave if np.ndim(frequency) else wave[0]
 
     def _apply_envelope(self, signal):
-        length = len(signal)
+        length = signal.shape[-1]
         decay_samples = int(self.decay * self.sample_rate)
         release_samples = int(self.release * self.sample_rate)
 
@@ -54,25 +70,51 @@ class MidiToSawWavConverter:
         looped = np.tile(audio, repeat_count)
         return looped[:repeat_count * len(audio)]
 
-    def _render_midi(self, midi_path):
-        midi = MidiFile(midi_path)
-        track_audio = np.zeros(1, dtype=np.float32)
+    def _tone_key(self, midi_note):
+        # Keyed by the shaping parameters too, so changing them on an instance takes effect
+        return (midi_note, self.sample_rate, self.decay, self.release, self.oscillator_method)
+
+    def _prepare_tones(self, midi_notes):
+        """Render the enveloped saw tones of all uncached pitches in one vectorized pass."""
+        missing = sorted({n for n in midi_notes if self._tone_key(n) not in self._tone_cache})
+        if not missing:
+            return
+        freqs = self._note_to_freq(np.asarray(missing, dtype=float))
+        tones = self._apply_envelope(self._saw_wave(freqs, 0.5 + self.release)).astype(np.float32)
+        for note, tone in zip(missing, tones):
+            self._tone_cache[self._tone_key(note)] = tone
+
+    def _note_tone(self, midi_note):
+        """Enveloped saw tone for one pitch, computed once and cached."""
+        key = self._tone_key(midi_note)
+        if key not in self._tone_cache:
+            self._prepare_tones([midi_note])
+        return self._tone_cache[key]
+
+    def _parse_note_events(self, midi):
+        starts = []
+        notes = []
         current_time = 0.0
-
         for msg in midi:
             current_time += msg.time
             if msg.type == 'note_on' and msg.velocity > 0:
-                freq = self._note_to_freq(msg.note)
-                tone_duration = 0.5 + self.release
-                tone = self._apply_envelope(self._saw_wave(freq, tone_duration))
+                starts.append(int(current_time * self.sample_rate))
+                notes.append(msg.note)
+        return np.asarray(starts, dtype=np.int64), notes
 
-                start = int(current_time * self.sample_rate)
-                end = start + len(tone)
+    def _render_midi(self, midi_path):
+        midi = MidiFile(midi_path)
+        starts, notes = self._parse_note_events(midi)
 
-                if end > len(track_audio):
-                    track_audio = np.pad(track_audio, (0, end - len(track_audio)))
+        tone_length = int(self.sample_rate * (0.5 + self.release))
+        length = int(starts.max()) + tone_length if len(notes) else 1
+        track_audio = np.zeros(max(length, 1), dtype=np.float32)
+        self._prepare_tones(notes)
 
-                track_audio[start:end] += tone.astype(np.float32)
+        # Every tone has the same length, so each note is one contiguous in-place add;
+        # this is faster than np.add.at and keeps the original summation order
+        for start, note in zip(starts, notes):
+            track_audio[start:start + tone_length] += self._note_tone(note)
 
         track_audio = self._loop_to_min_duration(track_audio)
 
@@ -81,14 +123,102 @@ class MidiToSawWavConverter:
 
         return track_audio
 
-    def convert_all(self):
-        for file in os.listdir(self.input_folder):
-            if file.lower().endswith((".mid", ".midi")):
-                midi_path = os.path.join(self.input_folder, file)
-                audio = self._render_midi(midi_path)
-                wav_name = os.path.splitext(file)[0] + ".wav"
-                wav_path = os.path.join(self.output_folder, wav_name)
-                write(wav_path, self.sample_rate, audio.astype(np.float32))
+    def _render_params(self) -> dict:
+        return {
+            "sample_rate": self.sample_rate,
+            "decay": self.decay,
+            "release": self.release,
+            "min_duration": self.min_duration,
+            "oscillator_method": self.oscillator_method,
+        }
+
+    def _convert_file(self, file):
+        midi_path = os.path.join(self.input_folder, file)
+        audio = self._render_midi(midi_path)
+        wav_name = os.path.splitext(file)[0] + ".wav"
+        wav_path = os.path.join(self.output_folder, wav_name)
+        write(wav_path, self.sample_rate, audio.astype(np.float32))
+        return wav_path
+
+    def _read_manifest(self) -> dict:
+        path = os.path.join(self.output_folder, self.MANIFEST_NAME)
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            # Missing or corrupted manifest: render everything again
+            return {}
+
+    def _write_manifest(self, manifest: dict):
+        path = os.path.join(self.output_folder, self.MANIFEST_NAME)
+        AtomicFile.write(path, json.dumps(manifest, indent=2, sort_keys=True))
+
+    def convert_all(self, max_workers: int = 1, incremental: bool = False):
+        """
+        Render every MIDI file in `input_folder` to a WAV file in `output_folder`.
+
+        Parameters
+        ----------
+        max_workers : int
+            Number of worker processes (default: 1, serial in-process).
+        incremental : bool
+            Skip files whose MIDI content hash and render parameters match the
+            last render recorded in the sidecar manifest, and whose WAV still exists
+            (default: False).
+
+        Returns
+        -------
+        list of str
+            WAV paths written by this call.
+        """
+        files = sorted(
+            file for file in os.listdir(self.input_folder)
+            if file.lower().endswith((".mid", ".midi"))
+        )
+
+        params = self._render_params()
+        manifest = self._read_manifest()
+        entries = {}
+        pending = []
+        for file in files:
+            with open(os.path.join(self.input_folder, file), "rb") as f:
+                midi_hash = hashlib.sha1(f.read()).hexdigest()
+            entries[file] = {"midi_sha1": midi_hash, "params": params}
+
+            wav_path = os.path.join(self.output_folder, os.path.splitext(file)[0] + ".wav")
+            if incremental and manifest.get(file) == entries[file] and os.path.exists(wav_path):
+                continue
+            pending.append(file)
+
+        print(f"Rendering {len(pending)} of {len(files)} MIDI files ({len(files) - len(pending)} unchanged).")
+
+        max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(pending) or 1))
+        if max_workers == 1:
+            written = [self._convert_file(file) for file in pending]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_convert_worker,
+                initargs=(self.input_folder, self.output_folder, params)
+            ) as executor:
+                written = list(executor.map(_run_convert_task, pending))
+
+        # Files no longer in input_folder are dropped from the manifest
+        self._write_manifest(entries)
+        return written
+
+
+# One converter per worker process, so the tone cache is reused across files
+_CONVERTER = None
+
+
+def _init_convert_worker(input_folder: str, output_folder: str, params: dict):
+    global _CONVERTER
+    _CONVERTER = MidiToSawWavConverter(input_folder, output_folder, **params)
+
+
+def _run_convert_task(file):
+    return _CONVERTER._convert_file(file)
 
 
 if __name__ == "__main__":
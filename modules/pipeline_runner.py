@@ -0,0 +1,271 @@
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .utils import AtomicFile
+
+
+class PipelineRunner:
+    """
+    Run a pipeline declared as a DAG of stages, with per-stage caching.
+
+    A stage is a function whose keyword arguments are the outputs of its
+    input stages plus its own parameters. Its cache key is the hash of
+    - the stage name, its `version` and the source code of its function
+    - its parameters
+    - the content digest of every input's output
+    - an optional `fingerprint()` value for external state (e.g. file mtimes)
+
+    With `cache_dir`, each output is pickled under its key. A stage whose key
+    is already present is not run and, unless something downstream needs the
+    value, not even loaded. Because keys depend on input *content*, changing
+    one parameter reruns that stage and only those downstream stages whose
+    inputs actually changed.
+
+    Stages whose inputs are ready run concurrently in a thread pool.
+    Stages declared with `serial=True` (e.g. matplotlib plots) run one at a
+    time on the calling thread instead.
+    """
+
+    def __init__(self, cache_dir: str = None, max_workers: int = 4):
+        """
+        Parameters
+        ----------
+        cache_dir : str, optional
+            Directory of the stage cache. Every stage runs on every call when None.
+        max_workers : int
+            Number of stages run concurrently (default: 4).
+        """
+        self.cache_dir = cache_dir
+        self.max_workers = max(1, max_workers)
+        self._stages = {}
+
+    # ========================================
+    # Declaration
+    # ========================================
+    def add_stage(
+        self,
+        name: str,
+        func,
+        inputs=(),
+        params: dict = None,
+        fingerprint=None,
+        cache: bool = True,
+        serial: bool = False,
+        version: int = 1
+    ):
+        """
+        Declare a stage.
+
+        Parameters
+        ----------
+        name : str
+            Unique stage name; also the keyword under which its output is passed downstream.
+        func : callable
+            Called as func(**{input: output, ...}, **params).
+        inputs : list of str
+            Names of the stages whose outputs this stage consumes.
+        params : dict, optional
+            Keyword parameters; must be JSON-serializable (others are hashed by repr).
+        fingerprint : callable, optional
+            Returns a JSON-serializable value describing external state the
+            output depends on, e.g. the mtime of a source file.
+        cache : bool
+            Store and reuse the output (default: True). Disable for stages whose
+            effect is external, such as network submissions with their own cache.
+        serial : bool
+            Run on the calling thread, never concurrently with other serial stages (default: False).
+        version : int
+            Bump to invalidate cached outputs after changing behaviour outside `func`.
+        """
+        if name in self._stages:
+            raise ValueError(f"Stage '{name}' is already defined.")
+        for dep in inputs:
+            if dep not in self._stages:
+                raise ValueError(f"Stage '{name}' depends on undefined stage '{dep}'.")
+        self._stages[name] = {
+            "func": func,
+            "inputs": list(inputs),
+            "params": dict(params or {}),
+            "fingerprint": fingerprint,
+            "cache": cache,
+            "serial": serial,
+            "version": version,
+        }
+
+    def set_params(self, name: str, **params):
+        """Update parameters of a declared stage."""
+        if name not in self._stages:
+            raise ValueError(f"Unknown stage '{name}'.")
+        self._stages[name]["params"].update(params)
+
+    def _ancestors(self, targets) -> list:
+        """Stages needed for `targets`, in topological order."""
+        order = []
+        seen = set()
+
+        def visit(name):
+            if name in seen:
+                return
+            if name not in self._stages:
+                raise ValueError(f"Unknown stage '{name}'.")
+            seen.add(name)
+            for dep in self._stages[name]["inputs"]:
+                visit(dep)
+            order.append(name)
+
+        for target in targets:
+            visit(target)
+        return order
+
+    # ========================================
+    # Cache
+    # ========================================
+    @staticmethod
+    def _func_source(func) -> str:
+        try:
+            return inspect.getsource(func)
+        except (OSError, TypeError):
+            return getattr(func, "__qualname__", repr(func))
+
+    def _stage_key(self, name: str, input_digests: dict) -> str:
+        stage = self._stages[name]
+        key = {
+            "name": name,
+            "version": stage["version"],
+            "source": self._func_source(stage["func"]),
+            "params": stage["params"],
+            "inputs": input_digests,
+            "fingerprint": stage["fingerprint"]() if stage["fingerprint"] is not None else None,
+        }
+        return hashlib.sha1(json.dumps(key, sort_keys=True, default=repr).encode("utf-8")).hexdigest()
+
+    def _cache_path(self, name: str, key: str, suffix: str) -> str:
+        return os.path.join(self.cache_dir, f"{name}-{key[:16]}{suffix}")
+
+    def _read_digest(self, name: str, key: str):
+        """Digest of a cached output, or None on a miss."""
+        meta_path = self._cache_path(name, key, ".json")
+        if not os.path.exists(meta_path) or not os.path.exists(self._cache_path(name, key, ".pkl")):
+            return None
+        try:
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta.get("digest") if meta.get("key") == key else None
+
+    def _write_cache(self, name: str, key: str, blob: bytes, digest: str, seconds: float):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        AtomicFile.write(self._cache_path(name, key, ".pkl"), blob)
+        AtomicFile.write(self._cache_path(name, key, ".json"), json.dumps({"key": key, "digest": digest, "seconds": seconds}))
+
+    # ========================================
+    # Execution
+    # ========================================
+    def _execute(self, name: str, state: dict):
+        """Run one stage or resolve it from the cache. Returns its output digest."""
+        stage = self._stages[name]
+        input_digests = {dep: state["digests"][dep] for dep in stage["inputs"]}
+        key = self._stage_key(name, input_digests)
+        state["keys"][name] = key
+
+        use_cache = self.cache_dir is not None and stage["cache"] and name not in state["force"]
+        if use_cache:
+            digest = self._read_digest(name, key)
+            if digest is not None:
+                print(f"[{name}] cached")
+                return digest
+
+        kwargs = {dep: self._load_output(dep, state) for dep in stage["inputs"]}
+        print(f"[{name}] running ...")
+        started = time.monotonic()
+        output = stage["func"](**kwargs, **stage["params"])
+        seconds = time.monotonic() - started
+        print(f"[{name}] done in {seconds:.2f}s")
+
+        try:
+            blob = pickle.dumps(output, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            blob = None
+        # Unpicklable outputs get a per-run digest: downstream stages always rerun
+        digest = hashlib.sha1(blob).hexdigest() if blob is not None else uuid.uuid4().hex
+
+        with state["lock"]:
+            state["outputs"][name] = output
+        if use_cache and blob is not None:
+            self._write_cache(name, key, blob, digest, seconds)
+        return digest
+
+    def _load_output(self, name: str, state: dict):
+        with state["lock"]:
+            if name in state["outputs"]:
+                return state["outputs"][name]
+        with open(self._cache_path(name, state["keys"][name], ".pkl"), "rb") as f:
+            output = pickle.load(f)
+        with state["lock"]:
+            state["outputs"][name] = output
+        return output
+
+    def run(self, targets=None, force=()) -> dict:
+        """
+        Bring `targets` up to date.
+
+        Parameters
+        ----------
+        targets : list of str, optional
+            Stages whose outputs are wanted (default: every stage).
+        force : list of str
+            Stages rerun even when cached (their dependents rerun only if the output changes).
+
+        Returns
+        -------
+        dict
+            Output of every target stage.
+        """
+        targets = list(targets) if targets is not None else list(self._stages)
+        order = self._ancestors(targets)
+        state = {
+            "digests": {},
+            "keys": {},
+            "outputs": {},
+            "force": set(force),
+            "lock": threading.Lock(),
+        }
+
+        remaining = list(order)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while remaining or running:
+                ready = [
+                    name for name in remaining
+                    if all(dep in state["digests"] for dep in self._stages[name]["inputs"])
+                ]
+                for name in ready:
+                    remaining.remove(name)
+                    if not self._stages[name]["serial"]:
+                        running[executor.submit(self._execute, name, state)] = name
+
+                serial_ready = [name for name in ready if self._stages[name]["serial"]]
+                for name in serial_ready:
+                    state["digests"][name] = self._execute(name, state)
+                if serial_ready:
+                    # Serial stages may have unblocked others; schedule them before waiting
+                    continue
+
+                if not running:
+                    if remaining:
+                        raise RuntimeError(f"Unresolvable stages: {remaining}")
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    state["digests"][name] = future.result()
+
+        return {name: self._load_output(name, state) for name in targets}
@@ -1,18 +1,36 @@
 import requests
 import pandas as pd
+import json
+import os
+import glob
 import time
-from .utils import TimeSortDataFrame
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from .utils import TimeSortDataFrame, RateLimiter, HttpSession, AtomicFile
 
 
 class SafecastLoader:
     """
     Retrieve measurement data from the Safecast API for a specific device and time range.
     Handles network errors gracefully by retrying failed requests and returning partial results.
+    Requests go through a pooled `HttpSession`, so connections are reused across pages.
     """
 
     BASE_URL = "https://api.safecast.org/en-US/measurements.json"
 
-    def __init__(self, time_sort: bool=False, timestamp_index_name: str=None, page_limit: int = 3, max_retries: int = 3, retry_delay: int = 5):
+    def __init__(
+        self,
+        time_sort: bool=False,
+        timestamp_index_name: str=None,
+        page_limit: int = 3,
+        max_retries: int = 3,
+        retry_delay: int = 5,
+        max_workers: int = 4,
+        requests_per_second: float = 2.0,
+        cache_dir: str = None,
+        base_url: str = None,
+        session: HttpSession = None
+    ):
         """
         Initialize the SafecastLoader.
 
@@ -23,13 +41,30 @@ class SafecastLoader:
         max_retries : int
             Number of retry attempts per failed request (default: 3).
         retry_delay : int
-            Waiting time in seconds between retries (default: 5).
+            Base delay in seconds of the exponential backoff between retries (default: 5).
+            A `Retry-After` header from the server takes precedence.
+        max_workers : int
+            Number of pages fetched in parallel by `fetch_device_data_concurrent` (default: 4).
+        requests_per_second : float
+            Request rate shared by all workers (default: 2.0).
+        cache_dir : str, optional
+            Directory for the per-page JSON cache. Disabled when None. Only
+            full pages of a range whose `date_to` has passed are cached.
+        base_url : str, optional
+            Override of the API endpoint, e.g. a local stub server for testing.
+        session : HttpSession, optional
+            Transport for all requests (default: the shared `HttpSession`).
         """
         self.time_sort = time_sort
         self.timestamp_index_name = timestamp_index_name
         self.page_limit = page_limit
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = RateLimiter(requests_per_second, burst=self.max_workers)
+        self.cache_dir = cache_dir
+        self.base_url = base_url or SafecastLoader.BASE_URL
+        self.session = session or HttpSession.shared()
 
     def fetch_device_data(self, user_id, date_from="2011-01-01", date_to="2025-12-31", limit: int = 1000):
         """
@@ -65,50 +100,372 @@ class SafecastLoader:
                 "limit": limit
             }
 
-            retries = 0
-            while retries <= self.max_retries:
-                try:
-                    response = requests.get(SafecastLoader.BASE_URL, params=params, timeout=10)
-                    print(f"Requesting page {page}... Status: {response.status_code}")
-
-                    # Retry only on temporary server-side errors
-                    if response.status_code >= 500:
-                        retries += 1
-                        print(f"Server error {response.status_code}, retrying ({retries}/{self.max_retries})...")
-                        time.sleep(self.retry_delay)
-                        continue
-
-                    if response.status_code != 200:
-                        print(f"Request failed with status {response.status_code}.")
-                        raise requests.RequestException
+            try:
+                response = self.session.get(
+                    self.base_url, params=params, timeout=10,
+                    max_retries=self.max_retries, backoff_base=self.retry_delay
+                )
+            except requests.RequestException as e:
+                print(f"Connection error: {e}. Failed to retrieve page {page} after {self.max_retries} retries. Stopping.")
+                break
+            print(f"Requesting page {page}... Status: {response.status_code}")
 
-                    data = response.json()
-                    if not data:
-                        print("No more data returned.")
-                        raise StopIteration
+            if response.status_code != 200:
+                print(f"Request for page {page} failed with status {response.status_code}. Stopping.")
+                break
 
-                    df.extend(data)
-                    print(f"Retrieved {len(data)} records from page {page}.")
-                    page += 1
-                    break  # success, break retry loop
-
-                except (requests.Timeout, requests.ConnectionError) as e:
-                    retries += 1
-                    print(f"Connection error: {e}. Retrying ({retries}/{self.max_retries})...")
-                    time.sleep(self.retry_delay)
-                except StopIteration:
-                    print("End of dataset reached.")
-                    return pd.DataFrame(df)
-                except Exception as e:
-                    print(f"Unexpected error: {e}")
-                    retries = self.max_retries + 1  # stop further retries
-
-            else:
-                print(f"Failed to retrieve page {page} after {self.max_retries} retries. Stopping.")
+            try:
+                data = response.json()
+            except ValueError as e:
+                print(f"Unexpected error: {e}")
                 break
 
+            if not data:
+                print("No more data returned.")
+                print("End of dataset reached.")
+                return pd.DataFrame(df)
+
+            df.extend(data)
+            print(f"Retrieved {len(data)} records from page {page}.")
+            page += 1
+
         if self.time_sort == True:
             time_sorter = TimeSortDataFrame(df, timestamp_index_name=self.timestamp_index_name)
             time_sorter.sort_by_time()
         print(f"Total records retrieved: {len(df)}")
         return pd.DataFrame(df)
+
+    # ========================================
+    # Concurrent fetching with per-page cache
+    # ========================================
+
+    def _page_cache_path(self, user_id, date_from, date_to, page, limit):
+        """Return the cache file path for a single page request."""
+        file_name = f"user{user_id}_{date_from}_{date_to}_page{page}_limit{limit}.json"
+        return os.path.join(self.cache_dir, file_name)
+
+    def _read_page_cache(self, path):
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # Corrupted cache entry: ignore and fetch again
+            return None
+
+    def _write_page_cache(self, path, data):
+        if path is None:
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        AtomicFile.write(path, json.dumps(data))
+
+    def _fetch_page(self, user_id, date_from, date_to, page, limit):
+        """
+        Fetch a single page, using the on-disk cache when available.
+
+        Returns
+        -------
+        list or None
+            Records of the page (empty list at the end of the dataset),
+            or None when the page could not be retrieved.
+        """
+        cache_path = None
+        if self.cache_dir is not None:
+            cache_path = self._page_cache_path(user_id, date_from, date_to, page, limit)
+            cached = self._read_page_cache(cache_path)
+            if cached is not None:
+                print(f"Page {page} loaded from cache ({len(cached)} records).")
+                return cached
+
+        params = {
+            "user_id": user_id,
+            "captured_after": date_from,
+            "captured_before": date_to,
+            "page": page,
+            "limit": limit
+        }
+
+        try:
+            # The limiter is acquired again before every retry
+            response = self.session.get(
+                self.base_url, params=params, timeout=10,
+                max_retries=self.max_retries, backoff_base=self.retry_delay,
+                rate_limiter=self.rate_limiter
+            )
+        except requests.RequestException as e:
+            print(f"Failed to retrieve page {page} after {self.max_retries} retries: {e}")
+            return None
+        print(f"Requesting page {page}... Status: {response.status_code}")
+
+        if response.status_code != 200:
+            print(f"Request for page {page} failed with status {response.status_code}.")
+            return None
+
+        try:
+            data = response.json() or []
+        except ValueError as e:
+            print(f"Unexpected error on page {page}: {e}")
+            return None
+
+        # Only full pages of a range that has already ended are cached: those
+        # can no longer change, whereas the last page of an open range grows
+        if len(data) == limit and self._range_is_closed(date_to):
+            self._write_page_cache(cache_path, data)
+        return data
+
+    @staticmethod
+    def _range_is_closed(date_to) -> bool:
+        """True when `date_to` lies in the past, so no new records can fall in the range."""
+        try:
+            end = pd.Timestamp(date_to)
+        except (ValueError, TypeError):
+            return False
+        if end.tzinfo is None:
+            end = end.tz_localize("UTC")
+        return end < pd.Timestamp.now(tz="UTC")
+
+    def fetch_device_data_concurrent(self, user_id, date_from="2011-01-01", date_to="2025-12-31", limit: int = 1000):
+        """
+        Fetch measurement data with a bounded pool of parallel page requests.
+
+        Up to `max_workers` pages are in flight at once, all sharing one rate
+        limiter. Pages already present in `cache_dir` are read from disk, so an
+        interrupted run resumes without downloading them again. Each completed
+        page is converted to a DataFrame immediately; the pages are concatenated
+        in order once the end of the dataset (an empty page) is reached.
+
+        Parameters
+        ----------
+        user_id : int
+            The unique ID of the Safecast device.
+        date_from : str
+            Start date (ISO format: YYYY-MM-DD).
+        date_to : str
+            End date (ISO format: YYYY-MM-DD).
+        limit : int, optional
+            Number of records per page (default 1000, API maximum).
+
+        Returns
+        -------
+        pandas.DataFrame
+            Combined DataFrame of all measurement records. If a page fails,
+            only the contiguous pages before it are returned.
+        """
+        df, _ = self._fetch_pages_concurrent(user_id, date_from, date_to, limit)
+        return df
+
+    def _fetch_pages_concurrent(self, user_id, date_from, date_to, limit):
+        """
+        Implementation of `fetch_device_data_concurrent`.
+
+        Returns
+        -------
+        (pandas.DataFrame, bool)
+            The records, and whether the empty end page was reached. False when
+            a page failed or `page_limit` cut the fetch short.
+        """
+        print(f"Fetching data for user_id={user_id} from {date_from} to {date_to} "
+              f"with {self.max_workers} workers ...")
+
+        frames = {}
+        end_page = self.page_limit + 1  # first page known to be empty or failed
+        end_is_empty = False
+        next_page = 1
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {}
+            while pending or (next_page < end_page):
+                while next_page < end_page and len(pending) < self.max_workers:
+                    future = executor.submit(self._fetch_page, user_id, date_from, date_to, next_page, limit)
+                    pending[future] = next_page
+                    next_page += 1
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page = pending.pop(future)
+                    data = future.result()
+                    if not data:
+                        if data is None:
+                            print(f"Stopping at page {page}.")
+                        else:
+                            print("End of dataset reached.")
+                        if page < end_page:
+                            end_page = page
+                            end_is_empty = data is not None
+                        continue
+                    frames[page] = pd.DataFrame(data)
+                    print(f"Retrieved {len(data)} records from page {page}.")
+
+        pages = [frames[page] for page in sorted(frames) if page < end_page]
+        df = pd.concat(pages, ignore_index=True) if pages else pd.DataFrame()
+
+        if self.time_sort and self.timestamp_index_name in df.columns:
+            df[self.timestamp_index_name] = pd.to_datetime(df[self.timestamp_index_name], errors="coerce")
+            df = df.sort_values(by=self.timestamp_index_name).reset_index(drop=True)
+
+        complete = end_is_empty and end_page <= self.page_limit
+        if not complete:
+            print(f"Fetch incomplete: stopped before the end of the dataset (page_limit={self.page_limit}).")
+        print(f"Total records retrieved: {len(df)}")
+        return df, complete
+
+    # ========================================
+    # Incremental sync into a partitioned local store
+    # ========================================
+
+    def _device_store_dir(self, store_dir, user_id):
+        return os.path.join(store_dir, f"user_{user_id}")
+
+    def _partition_files(self, device_dir, partition=None):
+        pattern = os.path.join(device_dir, partition or "date=*", "*.parquet")
+        return sorted(glob.glob(pattern))
+
+    SYNC_STATE_NAME = "_sync_state.json"
+
+    def _read_sync_watermark(self, device_dir):
+        """Start of the next sync request, or None if no complete sync has been recorded."""
+        path = os.path.join(device_dir, self.SYNC_STATE_NAME)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f).get("watermark")
+        except (OSError, ValueError):
+            return None
+
+    def _write_sync_watermark(self, device_dir, watermark):
+        os.makedirs(device_dir, exist_ok=True)
+        AtomicFile.write(os.path.join(device_dir, self.SYNC_STATE_NAME), json.dumps({"watermark": watermark}))
+
+    def get_latest_captured_at(self, user_id, store_dir: str = "./data/output/safecast_store/"):
+        """
+        Return the newest `captured_at` already stored for a device.
+
+        Only the most recent date partition is read.
+
+        Returns
+        -------
+        pandas.Timestamp or None
+            Newest stored timestamp (UTC), or None if nothing is stored yet.
+        """
+        device_dir = self._device_store_dir(store_dir, user_id)
+        partitions = sorted(
+            os.path.basename(path) for path in glob.glob(os.path.join(device_dir, "date=*"))
+            if self._partition_files(device_dir, os.path.basename(path))
+        )
+        if not partitions:
+            return None
+
+        files = self._partition_files(device_dir, partitions[-1])
+        latest = pd.concat([pd.read_parquet(f, columns=["captured_at"]) for f in files])
+        return latest["captured_at"].max()
+
+    def sync_device_data(
+        self,
+        user_id,
+        store_dir: str = "./data/output/safecast_store/",
+        date_from="2011-01-01",
+        date_to="2025-12-31",
+        limit: int = 1000,
+        id_column: str = "id"
+    ):
+        """
+        Fetch only measurements newer than the local store and append them.
+
+        The store holds one directory per device, partitioned by capture date
+        (`user_<id>/date=YYYY-MM-DD/part-*.parquet`). The request starts at the
+        sync watermark (or `date_from` on the first run), and rows whose
+        `id_column` already exists in the target partition are dropped, so
+        overlapping requests never create duplicates.
+
+        The API does not guarantee the order of the returned rows, so the
+        watermark only advances to the newest stored `captured_at` after a
+        complete fetch (the empty end page was reached). A fetch cut short by
+        `page_limit` or a failed page still stores what it got, but the next
+        run starts from the same point again instead of skipping missed rows.
+
+        Parameters
+        ----------
+        user_id : int
+            The unique ID of the Safecast device.
+        store_dir : str
+            Root directory of the partitioned store.
+        date_from : str
+            Start date used when nothing is stored yet (ISO format: YYYY-MM-DD).
+        date_to : str
+            End date (ISO format: YYYY-MM-DD).
+        limit : int, optional
+            Number of records per page (default 1000, API maximum).
+        id_column : str, optional
+            Column holding the unique measurement id (default: "id").
+
+        Returns
+        -------
+        pandas.DataFrame
+            The newly appended rows.
+        """
+        device_dir = self._device_store_dir(store_dir, user_id)
+        watermark = self._read_sync_watermark(device_dir)
+        if watermark is not None:
+            date_from = watermark
+            print(f"Local store for user_id={user_id} is complete up to {date_from}.")
+
+        df_new, complete = self._fetch_pages_concurrent(user_id, date_from, date_to, limit)
+        if df_new.empty:
+            self._advance_sync_watermark(user_id, store_dir, complete)
+            print("No new measurements.")
+            return df_new
+
+        df_new = df_new.drop_duplicates(subset=[id_column])
+        df_new["captured_at"] = pd.to_datetime(df_new["captured_at"], utc=True)
+        partition_keys = df_new["captured_at"].dt.strftime("%Y-%m-%d")
+
+        run_id = f"{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        appended = []
+        for day, df_day in df_new.groupby(partition_keys):
+            partition = f"date={day}"
+            existing_files = self._partition_files(device_dir, partition)
+            if existing_files:
+                existing_ids = pd.concat(
+                    [pd.read_parquet(f, columns=[id_column]) for f in existing_files]
+                )[id_column]
+                df_day = df_day[~df_day[id_column].isin(existing_ids)]
+            if df_day.empty:
+                continue
+
+            partition_dir = os.path.join(device_dir, partition)
+            os.makedirs(partition_dir, exist_ok=True)
+            part_path = os.path.join(partition_dir, f"part-{run_id}.parquet")
+            AtomicFile.write(part_path, lambda tmp_path: df_day.sort_values("captured_at").to_parquet(tmp_path, index=False))
+            appended.append(df_day)
+
+        df_appended = pd.concat(appended, ignore_index=True) if appended else df_new.iloc[0:0]
+        print(f"Appended {len(df_appended)} new records to {device_dir}")
+        # Only after the rows are stored, so an interrupted run never skips them
+        self._advance_sync_watermark(user_id, store_dir, complete)
+        return df_appended
+
+    def _advance_sync_watermark(self, user_id, store_dir, complete):
+        if not complete:
+            print("Sync watermark not advanced; the next sync starts from the same point. "
+                  "Raise page_limit if this repeats.")
+            return
+        latest = self.get_latest_captured_at(user_id, store_dir)
+        if latest is not None:
+            self._write_sync_watermark(
+                self._device_store_dir(store_dir, user_id), latest.strftime("%Y-%m-%dT%H:%M:%SZ")
+            )
+
+    def load_store(self, user_id, store_dir: str = "./data/output/safecast_store/"):
+        """
+        Load every stored measurement of a device, sorted by `captured_at`.
+
+        Returns
+        -------
+        pandas.DataFrame
+            All stored rows (empty if nothing is stored yet).
+        """
+        files = self._partition_files(self._device_store_dir(store_dir, user_id))
+        if not files:
+            return pd.DataFrame()
+        df = pd.concat([pd.read_parquet(f) for f in files], ignore_index=True)
+        return df.sort_values("captured_at").reset_index(drop=True)
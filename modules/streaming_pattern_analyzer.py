@@ -0,0 +1,184 @@
+import numpy as np
+import stumpy
+
+
+class StreamingPatternAnalyzer:
+    """
+    Incremental Matrix Profile analysis for a live sensor feed.
+
+    Samples are appended one at a time or in small batches. The first
+    `warmup` samples are buffered, then an incremental profile
+    (`stumpy.stumpi`) is built and updated with every new sample. Only the
+    last `history` samples are kept, so each update costs the same no matter
+    how long the feed has been running.
+
+    After each update the newest subsequence is checked:
+      - motif event   : its nearest-neighbour distance is the smallest in the
+                        history (or below `motif_threshold`)
+      - discord event : its distance is the largest in the history
+                        (or above `discord_threshold`)
+
+    Events are plain dicts so the music mapping stage can consume them directly.
+    """
+
+    def __init__(
+        self,
+        window_size: int,
+        history: int = 2000,
+        warmup: int = None,
+        motif_threshold: float = None,
+        discord_threshold: float = None,
+        on_event=None
+    ):
+        """
+        Parameters
+        ----------
+        window_size : int
+            Subsequence length of the matrix profile.
+        history : int
+            Number of most recent samples kept in the profile (default: 2000).
+        warmup : int, optional
+            Samples buffered before the profile is built (default: 4 * window_size).
+        motif_threshold : float, optional
+            Emit a motif event when the newest distance is below this value.
+            When None, an event is emitted when it is the smallest in the history.
+        discord_threshold : float, optional
+            Emit a discord event when the newest distance is above this value.
+            When None, an event is emitted when it is the largest in the history.
+        on_event : callable, optional
+            Called with each event dict as soon as it is detected.
+        """
+        if window_size < 3:
+            raise ValueError("window_size must be at least 3.")
+        self.window_size = int(window_size)
+        self.warmup = int(warmup) if warmup is not None else 4 * self.window_size
+        self.history = max(int(history), self.warmup)
+        if self.warmup <= self.window_size:
+            raise ValueError("warmup must be larger than window_size.")
+        self.motif_threshold = motif_threshold
+        self.discord_threshold = discord_threshold
+        self.on_event = on_event
+
+        self._buffer = []
+        self._stream = None
+        self._n_seen = 0
+        self._origin = 0
+
+    @property
+    def is_ready(self) -> bool:
+        """True once enough samples have arrived to build the profile."""
+        return self._stream is not None
+
+    @property
+    def profile(self) -> np.ndarray:
+        """Matrix profile distances over the retained history."""
+        if self._stream is None:
+            return np.empty(0)
+        return self._stream.P_
+
+    @property
+    def profile_index(self) -> np.ndarray:
+        """Nearest-neighbour start positions (absolute sample indices) over the retained history."""
+        if self._stream is None:
+            return np.empty(0, dtype=np.int64)
+        return self._stream.I_ + self._origin
+
+    def _offset(self) -> int:
+        """Absolute sample index of the first retained sample."""
+        return self._n_seen - len(self._stream.T_)
+
+    def _start(self, T: np.ndarray, egress: bool):
+        # stumpi reports neighbour indices relative to the T it was built from
+        self._origin = self._n_seen - len(T)
+        self._stream = stumpy.stumpi(T, self.window_size, egress=egress)
+
+    def update(self, value: float, timestamp=None) -> list:
+        """
+        Append one sample and return the events it triggered.
+
+        Parameters
+        ----------
+        value : float
+            New measurement.
+        timestamp : optional
+            Passed through to the emitted events.
+
+        Returns
+        -------
+        list of dict
+            Events with keys "type", "index", "match_index", "distance", "timestamp".
+        """
+        value = float(value)
+        self._n_seen += 1
+
+        if self._stream is None:
+            self._buffer.append(value)
+            if len(self._buffer) < self.warmup:
+                return []
+            self._build()
+        else:
+            if len(self._stream.T_) < self.history:
+                # Grow up to `history` samples before old ones start to egress
+                self._grow(value)
+            else:
+                self._stream.update(value)
+
+        return self._detect(timestamp)
+
+    def extend(self, values, timestamps=None) -> list:
+        """
+        Append a batch of samples and return all events they triggered, in order.
+        """
+        if timestamps is None:
+            timestamps = [None] * len(values)
+        events = []
+        for value, timestamp in zip(values, timestamps):
+            events.extend(self.update(value, timestamp))
+        return events
+
+    def _build(self):
+        T = np.asarray(self._buffer, dtype=float)
+        self._buffer = []
+        self._start(T, egress=len(T) >= self.history)
+
+    def _grow(self, value: float):
+        """Append without egress, switching to a fixed-length profile once `history` is reached."""
+        self._stream.update(value)
+        if len(self._stream.T_) >= self.history:
+            # Rebuild once with egress so later updates keep the window fixed
+            self._start(self._stream.T_, egress=True)
+
+    def _detect(self, timestamp) -> list:
+        P = self._stream.P_
+        distance = P[-1]
+        if not np.isfinite(distance):
+            return []
+
+        previous = P[:-1][np.isfinite(P[:-1])]
+        offset = self._offset()
+        base = {
+            "index": offset + len(P) - 1,
+            "match_index": int(self._stream.I_[-1]) + self._origin,
+            "distance": float(distance),
+            "timestamp": timestamp,
+        }
+
+        events = []
+        if self.motif_threshold is not None:
+            is_motif = distance < self.motif_threshold
+        else:
+            is_motif = previous.size > 0 and distance <= previous.min()
+        if is_motif:
+            events.append({"type": "motif", **base})
+
+        if self.discord_threshold is not None:
+            is_discord = distance > self.discord_threshold
+        else:
+            is_discord = previous.size > 0 and distance >= previous.max()
+        if is_discord:
+            events.append({"type": "discord", **base})
+
+        for event in events:
+            if self.on_event is not None:
+                self.on_event(event)
+        return events
@@ -0,0 +1,194 @@
+import asyncio
+import json
+
+
+class SunoCallbackReceiver:
+    """
+    Minimal asyncio HTTP server for SUNO completion callbacks.
+
+    SUNO POSTs a notification to the `callBackUrl` of a task when it changes
+    state. The receiver parses these notifications and resolves the future
+    returned by `expect(task_id)`:
+      - "complete" : resolved with the audio URL of the first track
+      - "error"    : failed with RuntimeError (also for a non-200 `code`)
+      - "text" / "first" (intermediate stages) are ignored
+
+    Notifications that arrive before `expect` is called are kept, so a task
+    that finishes while its submission response is still in transit is not
+    missed.
+
+    Only the standard library is used; one request per connection, which is
+    all a webhook sender needs. The server must be reachable by SUNO: pass
+    `public_url` when it sits behind a tunnel or reverse proxy.
+
+    Notifications are not authenticated. Treat a resolved future as a hint
+    and confirm the task through the API before using its result.
+    """
+
+    MAX_BODY_BYTES = 1024 * 1024
+    WILDCARD_HOSTS = ("", "0.0.0.0", "::")
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, path: str = "/suno/callback", public_url: str = None):
+        """
+        Parameters
+        ----------
+        host : str
+            Interface to listen on (default: "127.0.0.1"). A wildcard address
+            such as "0.0.0.0" requires `public_url`.
+        port : int
+            Port to listen on; 0 picks a free one (default: 0).
+        path : str
+            URL path that accepts notifications (default: "/suno/callback").
+        public_url : str, optional
+            Externally reachable URL of `path`, sent to SUNO as `callBackUrl`.
+            When None, it is built from `host` and the bound port.
+        """
+        self.host = host
+        self.port = port
+        self.path = path
+        self.public_url = public_url
+
+        self._server = None
+        self._pending = {}
+        self._received = {}
+
+    @property
+    def is_running(self) -> bool:
+        return self._server is not None
+
+    @property
+    def callback_url(self) -> str:
+        """URL to send as `callBackUrl`; available once the server is started."""
+        if self.public_url is not None:
+            return self.public_url
+        if self.host in self.WILDCARD_HOSTS:
+            raise ValueError(f"Cannot build a callback URL from wildcard host '{self.host}'; pass public_url.")
+        if self._server is None:
+            raise RuntimeError("Receiver is not started.")
+        return f"http://{self.host}:{self.port}{self.path}"
+
+    # ========================================
+    # Lifecycle
+    # ========================================
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        print(f"Listening for SUNO callbacks on {self.host}:{self.port}{self.path}")
+
+    async def stop(self):
+        if self._server is None:
+            return
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
+        for future in self._pending.values():
+            if not future.done():
+                future.cancel()
+        self._pending = {}
+        self._received = {}
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    # ========================================
+    # Task futures
+    # ========================================
+    def expect(self, task_id) -> asyncio.Future:
+        """
+        Return a future resolved with the audio URL once the task's completion arrives.
+        """
+        if task_id in self._pending:
+            return self._pending[task_id]
+        future = asyncio.get_running_loop().create_future()
+        self._pending[task_id] = future
+        if task_id in self._received:
+            self._resolve(future, *self._received.pop(task_id))
+        return future
+
+    def discard(self, task_id):
+        """Forget a task, e.g. after falling back to polling."""
+        self._pending.pop(task_id, None)
+        self._received.pop(task_id, None)
+
+    @staticmethod
+    def _resolve(future, audio_url, error):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(RuntimeError(error))
+        else:
+            future.set_result(audio_url)
+
+    @staticmethod
+    def parse_notification(body: dict):
+        """
+        Extract (task_id, audio_url, error) from a callback body.
+
+        Returns None for intermediate notifications and bodies without a task ID.
+        """
+        if not isinstance(body, dict):
+            return None
+        data = body.get("data") or {}
+        task_id = data.get("task_id") or data.get("taskId")
+        if task_id is None:
+            return None
+
+        callback_type = data.get("callbackType")
+        if body.get("code", 200) != 200 or callback_type == "error":
+            return task_id, None, f"Task {task_id} failed: {body.get('msg')}"
+        if callback_type != "complete":
+            return None
+
+        tracks = data.get("data") or []
+        if not tracks:
+            return task_id, None, f"Task {task_id} completed without tracks."
+        audio_url = tracks[0].get("audio_url") or tracks[0].get("audioUrl")
+        return task_id, audio_url, None
+
+    def _notify(self, body: dict):
+        parsed = self.parse_notification(body)
+        if parsed is None:
+            return
+        task_id, audio_url, error = parsed
+        future = self._pending.get(task_id)
+        if future is None:
+            self._received[task_id] = (audio_url, error)
+        else:
+            self._resolve(future, audio_url, error)
+
+    # ========================================
+    # HTTP
+    # ========================================
+    async def _handle(self, reader, writer):
+        status = "200 OK"
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get("content-length", 0))
+            if len(request_line) < 2 or request_line[0] != "POST" or request_line[1].split("?")[0] != self.path:
+                status = "404 Not Found"
+            elif length > self.MAX_BODY_BYTES:
+                status = "413 Payload Too Large"
+            else:
+                body = await reader.readexactly(length)
+                self._notify(json.loads(body))
+        except (ValueError, asyncio.IncompleteReadError) as e:
+            print(f"Invalid SUNO callback: {e}")
+            status = "400 Bad Request"
+
+        writer.write(f"HTTP/1.1 {status}\r\nContent-Length: 0\r\nConnection: close\r\n\r\n".encode("latin-1"))
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
@@ -0,0 +1,230 @@
+import asyncio
+import time
+
+from .utils import RateLimiter
+
+
+class SunoJobOrchestrator:
+    """
+    Concurrent submit / poll / download loop on top of `SunoMusicGenerator`.
+
+    Every job runs as its own asyncio task:
+      1. wait for one of `max_in_flight` slots
+      2. submit through `generate_music`
+      3. wait for completion: poll `get_task_status` every `poll_interval`
+         seconds, or, with a `SunoCallbackReceiver`, wait for SUNO's callback
+         and only start polling after `callback_deadline` as a fallback.
+         Callbacks are unauthenticated, so one only triggers an immediate
+         status check; the track URL always comes from the API
+      4. free the slot and download the track as soon as the task succeeds,
+         on the generator's bounded download pool
+
+    All API calls (submissions and status checks) draw from one token-bucket
+    `RateLimiter`, replacing the fixed sleeps between requests. The blocking
+    HTTP calls of the generator run in worker threads, so outstanding tasks
+    are polled concurrently rather than one after another.
+
+    Jobs whose request is already in the generator's result cache are served
+    from it without touching the API, and jobs with an identical request
+    payload within one batch are coalesced: only the first is submitted, the
+    others receive a copy of its track under their own filename.
+
+    A failing job is reported in its result instead of aborting the batch.
+    """
+
+    def __init__(
+        self,
+        generator,
+        max_in_flight: int = 4,
+        requests_per_second: float = 0.5,
+        burst: int = 1,
+        poll_interval: float = 30,
+        timeout: float = 600,
+        file_save_path: str = "./data/output/generated_music_suno",
+        receiver=None,
+        callback_deadline: float = 240
+    ):
+        """
+        Parameters
+        ----------
+        generator : SunoMusicGenerator
+            Client used for every request.
+        max_in_flight : int
+            Maximum number of submitted tasks that have not finished yet (default: 4).
+        requests_per_second : float
+            Sustained API request rate across submissions and polls (default: 0.5).
+        burst : int
+            Number of API requests that may be issued back-to-back (default: 1).
+        poll_interval : float
+            Seconds between two status checks of the same task (default: 30).
+        timeout : float
+            Seconds after submission before a task is given up (default: 600).
+        file_save_path : str
+            Root directory of the downloaded tracks.
+        receiver : SunoCallbackReceiver, optional
+            Completion webhook. Its URL is sent as `callBackUrl`; it is started
+            and stopped by `run_async` unless it is already running.
+        callback_deadline : float
+            Seconds after submission before polling starts when a receiver is used (default: 240).
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1.")
+        self.generator = generator
+        self.max_in_flight = int(max_in_flight)
+        self.limiter = RateLimiter(requests_per_second, burst=burst)
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.file_save_path = file_save_path
+        self.receiver = receiver
+        self.callback_deadline = callback_deadline
+
+    # ========================================
+    # Single job
+    # ========================================
+    async def _call_api(self, func, *args):
+        """Run one blocking API call in a thread once the rate limiter allows it."""
+        wait = self.limiter.delay()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return await asyncio.to_thread(func, *args)
+
+    async def _wait_for_task(self, task_id, callback=None):
+        """
+        Wait until one task succeeds, fails or times out; return its audio URL.
+
+        `callback` is the receiver's future for the task. Status checks begin
+        after `callback_deadline`, or as soon as the callback arrives. The
+        callback's own result is never used, since anyone can POST to the receiver.
+        """
+        started = time.monotonic()
+        while time.monotonic() - started < self.timeout:
+            elapsed = time.monotonic() - started
+            if callback is None:
+                await asyncio.sleep(self.poll_interval)
+            else:
+                wait = max(self.callback_deadline - elapsed, self.poll_interval)
+                await asyncio.wait([callback], timeout=min(wait, self.timeout - elapsed))
+                if callback.done():
+                    if not callback.cancelled() and callback.exception() is not None:
+                        print(f"[{task_id}] Callback reported: {callback.exception()}")
+                    print(f"[{task_id}] Callback received; confirming status.")
+                    # Poll normally from here on
+                    callback = None
+                elif time.monotonic() - started >= self.timeout:
+                    break
+                else:
+                    print(f"[{task_id}] No callback yet; checking status.")
+            try:
+                status, audio_url = await self._call_api(self.generator.get_task_status, task_id)
+            except Exception as e:
+                print(f"[{task_id}] Exception: {e}")
+                continue
+
+            if status == "SUCCESS":
+                return audio_url
+            if status in self.generator.FAILED_STATUSES:
+                raise RuntimeError(f"Task {task_id} failed with status {status}.")
+            print(f"[{task_id}] Status: {status} ... waiting ...")
+
+        raise RuntimeError(f"Task {task_id} not completed within {self.timeout} s.")
+
+    async def _run_job(self, job, slots):
+        result = {**job, "task_id": None, "audio_url": None, "path": None, "cached": False, "error": None}
+        try:
+            result["path"] = await asyncio.to_thread(
+                self.generator.load_cached_track,
+                job["prompt"], job["upload_url"], job["download_filename"], self.file_save_path
+            )
+            if result["path"] is not None:
+                result["cached"] = True
+                return result
+
+            async with slots:
+                callback_url = self.receiver.callback_url if self.receiver is not None else None
+                result["task_id"] = await self._call_api(
+                    self.generator.generate_music, job["prompt"], job["upload_url"], callback_url
+                )
+                if self.receiver is None:
+                    result["audio_url"] = await self._wait_for_task(result["task_id"])
+                else:
+                    try:
+                        result["audio_url"] = await self._wait_for_task(
+                            result["task_id"], self.receiver.expect(result["task_id"])
+                        )
+                    finally:
+                        self.receiver.discard(result["task_id"])
+
+            result["path"] = await asyncio.wrap_future(self.generator.submit_download(
+                result["audio_url"], job["download_filename"], self.file_save_path
+            ))
+            print(f"{result['path']} downloaded")
+            await asyncio.to_thread(
+                self.generator.store_cached_track,
+                job["prompt"], job["upload_url"], result["path"], result["task_id"], result["audio_url"]
+            )
+        except Exception as e:
+            result["error"] = str(e)
+            print(f"Job '{job['download_filename']}' failed: {e}")
+        return result
+
+    async def _follow_job(self, job, leader):
+        """Reuse the outcome of an identical request submitted earlier in the batch."""
+        source = await leader
+        result = {**job, "task_id": source["task_id"], "audio_url": source["audio_url"],
+                  "path": None, "cached": source["cached"], "error": source["error"]}
+        if source["path"] is not None:
+            try:
+                result["path"] = await asyncio.to_thread(
+                    self.generator.copy_track, source["path"], job["download_filename"], self.file_save_path
+                )
+            except Exception as e:
+                result["error"] = str(e)
+        return result
+
+    # ========================================
+    # Batch
+    # ========================================
+    async def run_async(self, jobs) -> list:
+        """
+        Run all jobs concurrently.
+
+        Parameters
+        ----------
+        jobs : list of dict
+            Each with keys "prompt", "upload_url" and "download_filename".
+
+        Returns
+        -------
+        list of dict
+            One result per job, in input order: the job keys plus "task_id",
+            "audio_url", "path" (local file), "cached" (served from the result
+            cache) and "error" (None on success).
+        """
+        own_receiver = self.receiver is not None and not self.receiver.is_running
+        if own_receiver:
+            await self.receiver.start()
+
+        try:
+            if self.receiver is not None:
+                # Fail before submitting anything if SUNO could not reach the receiver
+                self.receiver.callback_url
+            slots = asyncio.Semaphore(self.max_in_flight)
+            leaders = {}
+            runs = []
+            for job in jobs:
+                key = self.generator.request_key(job["prompt"], job["upload_url"])
+                if key in leaders:
+                    runs.append(self._follow_job(job, leaders[key]))
+                else:
+                    leaders[key] = asyncio.ensure_future(self._run_job(job, slots))
+                    runs.append(leaders[key])
+            return await asyncio.gather(*runs)
+        finally:
+            if own_receiver:
+                await self.receiver.stop()
+
+    def run(self, jobs) -> list:
+        """
+        Blocking wrapper around `run_async`.
+        """
+        return asyncio.run(self.run_async(jobs))
@@ -1,12 +1,41 @@
+import hashlib
 import json
 import os
 import time
-import requests
-import http.client
+from .utils import HttpSession, DownloadManager, AtomicFile
 
 class SunoMusicGenerator:
-    def __init__(self, style, config_path="./config/suno_api_config.json"):
+    BASE_URL = "https://apibox.erweima.ai"
+    # record-info statuses after which a task will never succeed
+    FAILED_STATUSES = ("CREATE_TASK_FAILED", "GENERATE_AUDIO_FAILED", "CALLBACK_EXCEPTION", "SENSITIVE_WORD_ERROR")
+
+    MODEL = "V3_5"
+    CALLBACK_URL = "https://api.example.com/callback"
+
+    def __init__(self, style, config_path="./config/suno_api_config.json", base_url=None, cache_dir=None, session=None, download_workers=4):
+        """
+        Parameters
+        ----------
+        style : str
+            Musical style sent with every request.
+        config_path : str
+            JSON file holding `suno_api_key`.
+        base_url : str, optional
+            API host (default: `BASE_URL`). Point it at a local mock server for testing.
+        cache_dir : str, optional
+            Directory of downloaded tracks keyed by the full request payload.
+            Identical requests are served from it without calling the API.
+            None disables the cache (default).
+        session : HttpSession, optional
+            Transport for all API calls and downloads (default: the shared `HttpSession`).
+        download_workers : int
+            Number of tracks downloaded in parallel (default: 4).
+        """
         self.style = style
+        self.base_url = (base_url or SunoMusicGenerator.BASE_URL).rstrip("/")
+        self.cache_dir = cache_dir
+        self.session = session or HttpSession.shared()
+        self.downloader = DownloadManager(session=self.session, max_workers=download_workers)
         try:
             with open(config_path, "r") as f:
                 config = json.load(f)
@@ -16,39 +45,58 @@ class SunoMusicGenerator:
         except Exception as e:
             raise RuntimeError(f"Failed to load config: {e}")
 
-        self.generate_url = "https://apibox.erweima.ai/api/v1/generate"
-        self.record_info_url = "https://apibox.erweima.ai/api/v1/generate/record-info?taskId="
+        self.generate_url = f"{self.base_url}/api/v1/generate"
+        self.record_info_url = f"{self.base_url}/api/v1/generate/record-info?taskId="
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Accept": "application/json",
             "Content-Type": "application/json"
         }
 
-        
-
-    def generate_music(self, prompt, upload_url):
-        conn = http.client.HTTPSConnection("apibox.erweima.ai")
-
-        payload = json.dumps({
+    def build_payload(self, prompt, upload_url, callback_url=None) -> dict:
+        """Request body of an upload-cover submission."""
+        return {
             "uploadUrl": upload_url,
             "prompt": prompt,
             "style": self.style,
             "title": self.style + " " + prompt,
             "customMode": True,
             "instrumental": True,
-            "model": "V3_5",
-            "callBackUrl": "https://api.example.com/callback"
-        })
+            "model": self.MODEL,
+            "callBackUrl": callback_url or self.CALLBACK_URL
+        }
+
+    def request_key(self, prompt, upload_url) -> str:
+        """
+        Content address of a submission: the hash of its payload.
+
+        The callback URL only decides where the completion is reported, not
+        what is generated, so it is left out.
+        """
+        payload = self.build_payload(prompt, upload_url)
+        del payload["callBackUrl"]
+        payload = json.dumps(payload, sort_keys=True)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def generate_music(self, prompt, upload_url, callback_url=None):
+        """
+        Submit an upload-cover task and return its task ID.
+
+        Parameters
+        ----------
+        callback_url : str, optional
+            Where SUNO reports completion, e.g. a `SunoCallbackReceiver` (default: `CALLBACK_URL`).
+        """
+        payload = json.dumps(self.build_payload(prompt, upload_url, callback_url))
 
-        conn.request("POST", "/api/v1/generate/upload-cover", payload, self.headers)
-        response = conn.getresponse()
+        response = self.session.post(f"{self.generate_url}/upload-cover", data=payload, headers=self.headers, timeout=30)
 
-        raw = response.read().decode("utf-8")
-        print("HTTP status:", response.status)
+        raw = response.content.decode("utf-8")
+        print("HTTP status:", response.status_code)
         print("Raw response:", raw)
 
-        if response.status != 200:
-            raise RuntimeError(f"API error {response.status}: {raw}")
+        if response.status_code != 200:
+            raise RuntimeError(f"API error {response.status_code}: {raw}")
 
         data_dict = json.loads(raw)
         task_id = data_dict["data"]["taskId"]
@@ -56,14 +104,34 @@ class SunoMusicGenerator:
 
     
 
+    def get_task_status(self, task_id):
+        """
+        Query record-info once.
+
+        Returns
+        -------
+        (str, str or None)
+            Task status and, once it is "SUCCESS", the URL of the first track.
+        """
+        res = self.session.get(f"{self.record_info_url}{task_id}", headers=self.headers, timeout=30)
+        if res.status_code != 200:
+            raise RuntimeError(f"Error {res.status_code}: {res.text}")
+
+        data = res.json()
+        status = data.get("data", {}).get("status")
+        if status == "SUCCESS":
+            suno_data = data["data"]["response"]["sunoData"]
+            return status, suno_data[0]["audioUrl"]
+        return status, None
+
     def poll_suno_task(self, task_id, timeout=600, interval=60):
-        url = f"https://apibox.erweima.ai/api/v1/generate/record-info?taskId={task_id}"
+        url = f"{self.record_info_url}{task_id}"
         elapsed = 0
         print(f"Polling... Task ID: {task_id}")
         
         while elapsed < timeout:
             try:
-                res = requests.get(url, headers=self.headers)
+                res = self.session.get(url, headers=self.headers)
                 if res.status_code != 200:
                     print(f"[{elapsed}s] Error {res.status_code}: {res.text}")
                     time.sleep(interval)
@@ -94,29 +162,104 @@ class SunoMusicGenerator:
     def download_tracks(self, url, download_filename, file_save_path="./data/output/generated_music_suno"):
         """
         Download the generated music file and save it locally as an MP3.
+
+        Dropped connections are resumed and the size is verified before the
+        file appears under its final name (see `DownloadManager`).
+        """
+        filename = self._track_path(download_filename, file_save_path)
+
+        print("Downloading track...")
+        self.downloader.download(url, filename)
+
+        print(f"Saved to {filename}")
+        return filename
+
+    def submit_download(self, url, download_filename, file_save_path="./data/output/generated_music_suno"):
+        """
+        Queue a track on the bounded download pool and return its `concurrent.futures.Future`.
         """
+        return self.downloader.submit(url, self._track_path(download_filename, file_save_path))
+
+    def download_all_tracks(self, items, file_save_path="./data/output/generated_music_suno"):
+        """
+        Download many tracks in parallel.
+
+        Parameters
+        ----------
+        items : list of (str, str)
+            (url, download_filename) pairs.
+
+        Returns
+        -------
+        list
+            Local path per item in input order, None for failed downloads.
+        """
+        return self.downloader.download_all(
+            [(url, self._track_path(name, file_save_path)) for url, name in items]
+        )
+
+    def _track_path(self, download_filename, file_save_path) -> str:
         timestamp = time.strftime("%Y%m%d_")
         output_dir = os.path.join(file_save_path, timestamp, self.style)
-        
+
         # Ensure the full directory path exists (including timestamped subfolder)
         os.makedirs(output_dir, exist_ok=True)
+        return os.path.join(output_dir, f"{download_filename}.mp3")
 
-        print("Downloading track...")
-        filename = os.path.join(output_dir, f"{download_filename}.mp3")
-        
-        res = requests.get(url, stream=True)
-        with open(filename, "wb") as f:
-            for chunk in res.iter_content(chunk_size=8192):
-                f.write(chunk)
+    def copy_track(self, src_path, download_filename, file_save_path="./data/output/generated_music_suno"):
+        """
+        Place an existing track under `download_filename`, as `download_tracks` would.
+        """
+        filename = self._track_path(download_filename, file_save_path)
+        if os.path.abspath(src_path) != os.path.abspath(filename):
+            AtomicFile.copy(src_path, filename)
+        return filename
 
-        print(f"Saved to {filename}")
+    # --- Result cache --- #
+    def load_cached_track(self, prompt, upload_url, download_filename, file_save_path="./data/output/generated_music_suno"):
+        """
+        Return the local path of a previously generated track for this request,
+        or None on a miss or when caching is disabled.
+        """
+        if self.cache_dir is None:
+            return None
+        cached_path = os.path.join(self.cache_dir, self.request_key(prompt, upload_url) + ".mp3")
+        if not os.path.exists(cached_path):
+            return None
+        filename = self.copy_track(cached_path, download_filename, file_save_path)
+        print(f"Loaded from cache: {filename}")
         return filename
 
+    def store_cached_track(self, prompt, upload_url, path, task_id=None, audio_url=None):
+        """
+        Record a downloaded track under the hash of its request payload.
+        """
+        if self.cache_dir is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        key = self.request_key(prompt, upload_url)
+        AtomicFile.copy(path, os.path.join(self.cache_dir, key + ".mp3"))
+
+        record = {
+            "payload": self.build_payload(prompt, upload_url),
+            "task_id": task_id,
+            "audio_url": audio_url,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        AtomicFile.write(os.path.join(self.cache_dir, key + ".json"), json.dumps(record, indent=2))
+
+    def run(self, prompt, upload_url, download_filename):
+        filename = self.load_cached_track(prompt, upload_url, download_filename)
+        if filename is not None:
+            return filename
 
-    def run(self, prompt, style, upload_url, download_filename):
-        task_id = self.generate_music(prompt, style, upload_url)
+        task_id = self.generate_music(prompt, upload_url)
         audio_url = self.poll_suno_task(task_id)
+        if audio_url is None:
+            raise RuntimeError(f"Task {task_id} did not complete.")
         filename = self.download_tracks(audio_url, download_filename)
+        self.store_cached_track(prompt, upload_url, filename, task_id, audio_url)
         print(f"file downloaded successfully: {filename}")
+        return filename
         
         
\ No newline at end of file
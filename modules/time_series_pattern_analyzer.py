@@ -2,6 +2,137 @@ import pandas as pd
 import numpy as np
 import stumpy
 import matplotlib.pyplot as plt
+import itertools
+import os
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+
+MODES = ("exact", "scrump", "downsample")
+
+# Resampled arrays shared by every task of a batch run. Each pool worker
+# receives them once through the initializer instead of once per task.
+_BATCH_SERIES = {}
+_BATCH_SETTINGS = {}
+
+
+def _init_batch_worker(series: dict, numba_threads: int, settings: dict = None):
+    """Store the shared arrays in the worker and cap numba threads to avoid oversubscription."""
+    global _BATCH_SERIES, _BATCH_SETTINGS
+    _BATCH_SERIES = series
+    _BATCH_SETTINGS = settings or {}
+    if numba_threads:
+        import numba
+        numba.set_num_threads(numba_threads)
+
+
+def _run_batch_task(label1, label2, window_size: int):
+    """Compute one cross matrix profile from the shared arrays and summarize it."""
+    profile = _matrix_profile(_BATCH_SERIES[label1], _BATCH_SERIES[label2], window_size, **_BATCH_SETTINGS)
+    summary = TimeSeriesPatternAnalyzer.summarize_profile(profile)
+    return {"series1": label1, "series2": label2, "window_size": window_size, **summary}
+
+
+def _matrix_profile(
+    ts1: np.ndarray,
+    ts2: np.ndarray,
+    window_size: int,
+    mode: str = "exact",
+    percentage: float = 0.1,
+    downsample_factor: int = 8,
+    refine_candidates: int = 10
+) -> np.ndarray:
+    """
+    Cross matrix profile of ts1 against ts2 with the selected engine.
+
+    Every mode returns an array shaped like `stumpy.stump`: distance, nearest
+    neighbour index, left index, right index per subsequence of ts1.
+    """
+    if mode == "exact":
+        return stumpy.stump(ts1, window_size, T_B=ts2)
+
+    if mode == "scrump":
+        approx = stumpy.scrump(ts1, window_size, T_B=ts2, ignore_trivial=False, percentage=percentage, pre_scrump=True)
+        approx.update()
+        return _as_profile(approx.P_, approx.I_)
+
+    if mode == "downsample":
+        return _downsample_refine(ts1, ts2, window_size, downsample_factor, refine_candidates)
+
+    raise ValueError(f"Unknown mode '{mode}'. Choose from {MODES}.")
+
+
+def _as_profile(P: np.ndarray, I: np.ndarray) -> np.ndarray:
+    """Stack distances and indices into a stump-shaped array (left/right indices unknown)."""
+    missing = np.full(len(P), -1)
+    return np.column_stack([P, I, missing, missing]).astype(float)
+
+
+def _downsample_refine(ts1, ts2, window_size: int, factor: int, n_candidates: int) -> np.ndarray:
+    """
+    Approximate cross matrix profile via block-mean downsampling, with exact refinement.
+
+    The profile is computed on both series averaged over blocks of `factor`
+    samples and mapped back to full resolution, with distances rescaled to the
+    full window length. Around the best `n_candidates` coarse motifs, each
+    full-resolution subsequence is then matched exactly against the
+    neighbourhood of its coarse match.
+    """
+    factor = int(factor)
+    coarse_window = window_size // factor
+    n1, n2 = len(ts1) // factor, len(ts2) // factor
+    if factor <= 1 or coarse_window < 3 or min(n1, n2) < coarse_window:
+        return stumpy.stump(ts1, window_size, T_B=ts2)
+
+    coarse1 = ts1[:n1 * factor].reshape(n1, factor).mean(axis=1)
+    coarse2 = ts2[:n2 * factor].reshape(n2, factor).mean(axis=1)
+    coarse = stumpy.stump(coarse1, coarse_window, T_B=coarse2)
+    coarse_P = coarse[:, 0].astype(float)
+    coarse_I = coarse[:, 1].astype(np.int64)
+
+    # z-normalized distances grow with sqrt(window length)
+    scale = np.sqrt(window_size / coarse_window)
+    l1 = len(ts1) - window_size + 1
+    last_start = len(ts2) - window_size
+    pos = np.minimum(np.arange(l1) // factor, len(coarse_P) - 1)
+    P = coarse_P[pos] * scale
+    I = np.clip(coarse_I[pos] * factor, 0, last_start)
+
+    refined = np.zeros(l1, dtype=bool)
+    for c in _top_k_motifs(coarse_P, n_candidates, int(np.ceil(coarse_window / 4))):
+        lo2 = max(0, (coarse_I[c] - 1) * factor)
+        hi2 = min(len(ts2), (coarse_I[c] + 2) * factor + window_size)
+        for i in range(max(0, (c - 1) * factor), min(l1, (c + 2) * factor)):
+            D = stumpy.mass(ts1[i:i + window_size], ts2[lo2:hi2])
+            if not np.isfinite(D).any():
+                continue
+            j = int(np.nanargmin(np.where(np.isfinite(D), D, np.nan)))
+            P[i] = D[j]
+            I[i] = lo2 + j
+            refined[i] = True
+
+    # Averaging removes noise, so coarse distances underestimate the full ones.
+    # Calibrate the remaining estimates against the refined positions.
+    ratio = P[refined] / (coarse_P[pos[refined]] * scale)
+    ratio = ratio[np.isfinite(ratio) & (ratio > 0)]
+    if ratio.size:
+        P[~refined] *= np.median(ratio)
+
+    return _as_profile(P, I)
+
+
+def _top_k_motifs(mp: np.ndarray, k: int, exclusion: int) -> list:
+    """Positions of the k smallest finite profile values, at least `exclusion` apart."""
+    mp = np.where(np.isfinite(mp), mp, np.inf)
+    order = np.argsort(mp, kind="stable")
+    picked = []
+    for i in order:
+        if len(picked) >= k or not np.isfinite(mp[i]):
+            break
+        if all(abs(int(i) - p) > exclusion for p in picked):
+            picked.append(int(i))
+    return picked
 
 
 class TimeSeriesPatternAnalyzer:
@@ -15,9 +146,47 @@ class TimeSeriesPatternAnalyzer:
       - Visualization of results
     """
 
-    def __init__(self, df1: pd.DataFrame, df2: pd.DataFrame):
+    # Coarse motifs refined at full resolution in "downsample" mode
+    REFINE_CANDIDATES = 10
+
+    def __init__(
+        self,
+        df1: pd.DataFrame,
+        df2: pd.DataFrame,
+        mode: str = "exact",
+        percentage: float = 0.1,
+        downsample_factor: int = 8
+    ):
+        """
+        Parameters
+        ----------
+        mode : str
+            Matrix Profile engine (default: "exact").
+              - "exact"      : `stumpy.stump`, O(n^2)
+              - "scrump"     : `stumpy.scrump` evaluating `percentage` of the distance matrix
+              - "downsample" : profile of block-averaged series, refined exactly around the best motifs
+        percentage : float
+            Fraction of the distance matrix evaluated in "scrump" mode (default: 0.1).
+        downsample_factor : int
+            Block length used in "downsample" mode (default: 8).
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode '{mode}'. Choose from {MODES}.")
+        if not 0 < percentage <= 1:
+            raise ValueError("percentage must be in (0, 1].")
         self.df1 = df1.copy()
         self.df2 = df2.copy()
+        self.mode = mode
+        self.percentage = percentage
+        self.downsample_factor = downsample_factor
+
+    def _profile_settings(self, mode: str = None) -> dict:
+        return {
+            "mode": mode or self.mode,
+            "percentage": self.percentage,
+            "downsample_factor": self.downsample_factor,
+            "refine_candidates": self.REFINE_CANDIDATES,
+        }
 
     def _prepare_timestamp(self, df: pd.DataFrame, col_timestamp: str):
         """Convert timestamp column to datetime and set as index."""
@@ -78,10 +247,162 @@ class TimeSeriesPatternAnalyzer:
         return ts1.astype(float), ts2.astype(float)
 
     def compute_cross_matrix_profile(self, ts1: np.ndarray, ts2: np.ndarray, window_size: int):
-        """Perform cross-matrix profile analysis."""
-        profile = stumpy.stump(ts1, window_size, T_B=ts2)
+        """Perform cross-matrix profile analysis with the engine selected by `mode`."""
+        profile = _matrix_profile(ts1, ts2, window_size, **self._profile_settings())
         return profile
 
+    def evaluate_approximation(self, ts1: np.ndarray, ts2: np.ndarray, window_size: int, k: int = 5) -> dict:
+        """
+        Compare the configured mode against the exact profile on the same data.
+
+        Both engines are warmed up on a short slice first so numba compilation
+        is not counted. A top-k motif of the exact profile counts as found when
+        an approximate top-k motif starts within the exclusion zone (window_size / 4).
+
+        Returns
+        -------
+        dict
+            mode, exact_seconds, approx_seconds, speedup, top_k_agreement,
+            exact_motifs, approx_motifs.
+        """
+        ts1 = np.asarray(ts1, dtype=float)
+        ts2 = np.asarray(ts2, dtype=float)
+        exclusion = int(np.ceil(window_size / 4))
+
+        warmup = 4 * window_size * max(1, int(self.downsample_factor))
+        for mode in ("exact", self.mode):
+            _matrix_profile(ts1[:warmup], ts2[:warmup], window_size, **self._profile_settings(mode))
+
+        start = time.perf_counter()
+        exact = _matrix_profile(ts1, ts2, window_size, **self._profile_settings("exact"))
+        exact_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        approx = _matrix_profile(ts1, ts2, window_size, **self._profile_settings())
+        approx_seconds = time.perf_counter() - start
+
+        exact_motifs = _top_k_motifs(exact[:, 0].astype(float), k, exclusion)
+        approx_motifs = _top_k_motifs(approx[:, 0].astype(float), k, exclusion)
+        found = sum(any(abs(e - a) <= exclusion for a in approx_motifs) for e in exact_motifs)
+
+        return {
+            "mode": self.mode,
+            "exact_seconds": exact_seconds,
+            "approx_seconds": approx_seconds,
+            "speedup": exact_seconds / approx_seconds if approx_seconds > 0 else np.inf,
+            "top_k_agreement": found / len(exact_motifs) if exact_motifs else np.nan,
+            "exact_motifs": exact_motifs,
+            "approx_motifs": approx_motifs,
+        }
+
+    # ========================================
+    # Batched computation
+    # ========================================
+
+    @staticmethod
+    def summarize_profile(profile: np.ndarray) -> dict:
+        """
+        Extract the best motif and the top discord from a matrix profile.
+
+        The motif is the subsequence with the smallest distance to its nearest
+        neighbour, the discord the one with the largest finite distance.
+        Positions are NaN when the profile has no finite distance.
+        """
+        mp = profile[:, 0].astype(float)
+        finite = np.flatnonzero(np.isfinite(mp))
+        if finite.size == 0:
+            return {
+                "motif_index": np.nan, "motif_match_index": np.nan, "motif_distance": np.nan,
+                "discord_index": np.nan, "discord_distance": np.nan,
+            }
+
+        motif = finite[np.argmin(mp[finite])]
+        discord = finite[np.argmax(mp[finite])]
+        return {
+            "motif_index": int(motif),
+            "motif_match_index": int(profile[motif, 1]),
+            "motif_distance": float(mp[motif]),
+            "discord_index": int(discord),
+            "discord_distance": float(mp[discord]),
+        }
+
+    def compute_batch_matrix_profiles(
+        self,
+        series: dict,
+        window_sizes,
+        pairs=None,
+        max_workers: int = None,
+        numba_threads: int = 1
+    ) -> pd.DataFrame:
+        """
+        Compute cross matrix profiles for many series pairs and window sizes.
+
+        Parameters
+        ----------
+        series : dict
+            Mapping of label -> resampled 1-D array, e.g. the columns of
+            `TimeAlignedDataMerger.merge_many()`, one entry per sensor site.
+            Each array is sent to a worker once and reused for every pair and window.
+        window_sizes : list of int
+            Subsequence lengths to evaluate.
+        pairs : list of (label, label), optional
+            Pairs to compare. Defaults to every combination of the labels in `series`.
+        max_workers : int, optional
+            Number of worker processes (default: os.cpu_count()). 1 runs serially in-process.
+        numba_threads : int
+            numba threads per worker process (default: 1). None keeps numba's default.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per (series1, series2, window_size) with motif/discord positions and distances.
+        """
+        series = {label: np.asarray(ts, dtype=float) for label, ts in series.items()}
+        window_sizes = [int(m) for m in window_sizes]
+        if pairs is None:
+            pairs = list(itertools.combinations(series.keys(), 2))
+
+        tasks = []
+        for label1, label2 in pairs:
+            for label in (label1, label2):
+                if label not in series:
+                    raise ValueError(f"Unknown series label: {label}")
+            shortest = min(len(series[label1]), len(series[label2]))
+            for m in window_sizes:
+                if m < 3 or m > shortest:
+                    raise ValueError(f"Window size {m} is invalid for pair ({label1}, {label2}) of length {shortest}.")
+                tasks.append((label1, label2, m))
+
+        columns = [
+            "series1", "series2", "window_size",
+            "motif_index", "motif_match_index", "motif_distance",
+            "discord_index", "discord_distance",
+        ]
+        if not tasks:
+            return pd.DataFrame(columns=columns)
+
+        max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(tasks)))
+        if max_workers == 1:
+            _init_batch_worker(series, None, self._profile_settings())
+            try:
+                rows = [_run_batch_task(*task) for task in tasks]
+            finally:
+                _init_batch_worker({}, None)
+        else:
+            # spawn: numba's threading layer is not fork-safe once the parent has run stumpy
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_batch_worker,
+                initargs=(series, numba_threads, self._profile_settings())
+            ) as executor:
+                # Longest jobs first so the pool does not finish on a straggler
+                order = sorted(range(len(tasks)), key=lambda i: -len(series[tasks[i][0]]) * len(series[tasks[i][1]]))
+                futures = {i: executor.submit(_run_batch_task, *tasks[i]) for i in order}
+                rows = [futures[i].result() for i in range(len(tasks))]
+
+        return pd.DataFrame(rows, columns=columns)
+
     def plot_results(self, ts1, ts2, profile, window_size: int, label1="Series 1", label2="Series 2"):
         """
         Plot:
@@ -5,5 +5,10 @@ from .time_sort_dataframe import TimeSortDataFrame
 from .random_segment_picker import RandomSegmentPicker
 from .filter_common_timestamp_range import FilterCommonTimestampRange
 from .time_aligned_data_merger import TimeAlignedDataMerger
+from .rate_limiter import RateLimiter
+from .band_limited_oscillator import BandLimitedOscillator
+from .http_session import HttpSession
+from .download_manager import DownloadManager
+from .atomic_file import AtomicFile
 
-__all__ = ["Visualizer", "TimestampConvertToDatetime", "CSVNaNReplacer", "RandomSegmentPicker", "TimeSortDataFrame", "FilterCommonTimestampRange", "TimeAlignedDataMerger"]
+__all__ = ["Visualizer", "TimestampConvertToDatetime", "CSVNaNReplacer", "RandomSegmentPicker", "TimeSortDataFrame", "FilterCommonTimestampRange", "TimeAlignedDataMerger", "RateLimiter", "BandLimitedOscillator", "HttpSession", "DownloadManager", "AtomicFile"]
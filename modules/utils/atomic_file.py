@@ -0,0 +1,61 @@
+import os
+import shutil
+import uuid
+
+
+class AtomicFile:
+    """
+    Write or copy files so that readers only ever see complete contents.
+
+    The data goes to a temporary file next to the destination, named after
+    the process and a random suffix so concurrent threads and processes never
+    share one, and is then moved into place with os.replace. The temporary
+    file is removed when writing fails.
+    """
+
+    @staticmethod
+    def _tmp_path(path: str) -> str:
+        return f"{path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+
+    @staticmethod
+    def write(path: str, content, encoding: str = "utf-8") -> str:
+        """
+        Atomically replace `path`.
+
+        Parameters
+        ----------
+        path : str
+            Destination file. Its directory must exist.
+        content : bytes, str or callable
+            Bytes or text (encoded with `encoding`) to store, or a function
+            called with the temporary path that writes the file itself,
+            e.g. ``lambda tmp: df.to_parquet(tmp)``.
+        encoding : str
+            Encoding of text content (default: "utf-8").
+
+        Returns
+        -------
+        str
+            `path`.
+        """
+        tmp_path = AtomicFile._tmp_path(path)
+        try:
+            if callable(content):
+                content(tmp_path)
+            else:
+                if isinstance(content, str):
+                    content = content.encode(encoding)
+                with open(tmp_path, "wb") as f:
+                    f.write(content)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return path
+
+    @staticmethod
+    def copy(src_path: str, dest_path: str) -> str:
+        """
+        Atomically copy `src_path` to `dest_path`. Returns `dest_path`.
+        """
+        return AtomicFile.write(dest_path, lambda tmp_path: shutil.copyfile(src_path, tmp_path))
@@ -0,0 +1,209 @@
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from urllib3.exceptions import HTTPError
+
+from .http_session import HttpSession
+
+
+class DownloadManager:
+    """
+    Resumable, verified file downloads over the shared `HttpSession`.
+
+    Each file is streamed into `<dest>.part`. When the connection drops, the
+    transfer continues from the end of the partial file with an HTTP Range
+    request (also across runs), instead of starting over. The byte count is
+    checked against Content-Length / Content-Range before the partial file is
+    renamed to its final name with os.replace, so a truncated file never
+    appears under the destination path.
+
+    The read size adapts to the connection: it doubles while reads complete
+    quickly and halves when they stall, between `min_chunk` and `max_chunk`.
+
+    Several files are downloaded in parallel by a bounded thread pool
+    (`submit` / `download_all`).
+    """
+
+    PART_SUFFIX = ".part"
+    CHUNK_TARGET_SECONDS = 0.25
+    CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+
+    def __init__(
+        self,
+        session: HttpSession = None,
+        max_workers: int = 4,
+        max_retries: int = 5,
+        min_chunk: int = 64 * 1024,
+        max_chunk: int = 4 * 1024 * 1024
+    ):
+        """
+        Parameters
+        ----------
+        session : HttpSession, optional
+            Transport (default: the shared `HttpSession`).
+        max_workers : int
+            Number of files downloaded in parallel (default: 4).
+        max_retries : int
+            Consecutive interrupted attempts without progress before giving up (default: 5).
+        min_chunk : int
+            Smallest read size in bytes (default: 64 KiB).
+        max_chunk : int
+            Largest read size in bytes (default: 4 MiB).
+        """
+        if min_chunk <= 0 or max_chunk < min_chunk:
+            raise ValueError("Require 0 < min_chunk <= max_chunk.")
+        self.session = session or HttpSession.shared()
+        self.max_workers = max(1, max_workers)
+        self.max_retries = max_retries
+        self.min_chunk = min_chunk
+        self.max_chunk = max_chunk
+
+        self._executor = None
+        self._lock = threading.Lock()
+
+    # ========================================
+    # Single file
+    # ========================================
+    def download(self, url: str, dest_path: str) -> str:
+        """
+        Download `url` to `dest_path`, resuming a partial file left by an earlier attempt.
+
+        Returns
+        -------
+        str
+            `dest_path`.
+
+        Raises
+        ------
+        RuntimeError
+            When the transfer keeps failing or the size does not match the server's.
+        """
+        part_path = dest_path + self.PART_SUFFIX
+        os.makedirs(os.path.dirname(os.path.abspath(dest_path)), exist_ok=True)
+
+        failures = 0
+        while True:
+            offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+            try:
+                total = self._transfer(url, part_path, offset)
+            except (requests.RequestException, HTTPError, OSError) as e:
+                written = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+                failures = 0 if written > offset else failures + 1
+                if failures > self.max_retries:
+                    raise RuntimeError(f"Download of {url} failed after {self.max_retries} retries: {e}")
+                delay = random.uniform(0, min(10.0, 0.5 * 2 ** failures))
+                print(f"Download interrupted at {written} bytes: {e}. Resuming in {delay:.1f}s...")
+                time.sleep(delay)
+                continue
+
+            size = os.path.getsize(part_path)
+            if total is not None and size != total:
+                # Corrupt partial file (e.g. the remote file changed): start over
+                os.remove(part_path)
+                failures += 1
+                if failures > self.max_retries:
+                    raise RuntimeError(f"Size mismatch for {url}: got {size} bytes, expected {total}.")
+                continue
+
+            os.replace(part_path, dest_path)
+            return dest_path
+
+    def _transfer(self, url: str, part_path: str, offset: int):
+        """
+        Append the remaining bytes of `url` to `part_path`.
+
+        Returns
+        -------
+        int or None
+            Expected full size of the file, or None when the server does not report it.
+        """
+        # Ranges refer to the stored bytes, so ask for the file as-is
+        headers = {"Accept-Encoding": "identity"}
+        if offset > 0:
+            headers["Range"] = f"bytes={offset}-"
+
+        with self.session.get(url, headers=headers, stream=True) as response:
+            if response.status_code == 416:
+                # Nothing left to fetch, or the partial file is longer than the remote one
+                match = re.match(r"bytes \*/(\d+)", response.headers.get("Content-Range", ""))
+                if match is not None and int(match.group(1)) == offset:
+                    return offset
+                os.remove(part_path)
+                raise requests.RequestException(f"Range not satisfiable at offset {offset}; restarting.")
+            response.raise_for_status()
+
+            if response.status_code == 206:
+                match = self.CONTENT_RANGE.match(response.headers.get("Content-Range", ""))
+                if match is None or int(match.group(1)) != offset:
+                    raise RuntimeError(f"Unexpected Content-Range for {url}: {response.headers.get('Content-Range')}")
+                total = None if match.group(3) == "*" else int(match.group(3))
+                mode = "ab"
+            else:
+                # Range ignored by the server: the body is the whole file
+                length = response.headers.get("Content-Length")
+                total = int(length) if length is not None else None
+                mode = "wb"
+
+            chunk = self.min_chunk
+            with open(part_path, mode) as f:
+                while True:
+                    started = time.monotonic()
+                    data = response.raw.read(chunk)
+                    if not data:
+                        break
+                    f.write(data)
+
+                    elapsed = time.monotonic() - started
+                    if elapsed < self.CHUNK_TARGET_SECONDS / 2:
+                        chunk = min(self.max_chunk, chunk * 2)
+                    elif elapsed > self.CHUNK_TARGET_SECONDS * 2:
+                        chunk = max(self.min_chunk, chunk // 2)
+        return total
+
+    # ========================================
+    # Parallel downloads
+    # ========================================
+    def submit(self, url: str, dest_path: str):
+        """
+        Queue a download on the bounded pool and return its `concurrent.futures.Future`.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            return self._executor.submit(self.download, url, dest_path)
+
+    def download_all(self, items) -> list:
+        """
+        Download many files in parallel.
+
+        Parameters
+        ----------
+        items : list of (str, str)
+            (url, dest_path) pairs.
+
+        Returns
+        -------
+        list
+            Destination path per item in input order, None for failed downloads.
+        """
+        futures = [self.submit(url, dest_path) for url, dest_path in items]
+        paths = []
+        for (url, _), future in zip(items, futures):
+            try:
+                paths.append(future.result())
+            except Exception as e:
+                print(f"Failed to download {url}: {e}")
+                paths.append(None)
+        return paths
+
+    def close(self):
+        """Shut down the worker pool; later submissions start a new one."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
@@ -0,0 +1,179 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HttpSession:
+    """
+    Shared HTTP transport for every network call of the project.
+
+    Wraps one `requests.Session`, so connections (and their TLS handshakes)
+    are kept alive and reused across calls and threads, and adds:
+      - default connect/read timeouts
+      - retries with exponential backoff and full jitter, honoring `Retry-After`
+      - gzip/deflate negotiation (bodies are decompressed transparently)
+      - a per-host limit on concurrent requests
+
+    Idempotent methods are retried on connection errors and on `RETRY_STATUSES`.
+    Other methods (e.g. POST) are only retried on 429, where the server
+    guarantees the request was not processed, so a job is never submitted twice.
+
+    The per-host slot is held until the response headers arrive; the body of
+    a `stream=True` response is read outside of it.
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        timeout=(5, 30),
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        max_per_host: int = 8
+    ):
+        """
+        Parameters
+        ----------
+        timeout : float or (float, float)
+            Default (connect, read) timeout in seconds, overridable per request (default: (5, 30)).
+        max_retries : int
+            Default number of retries per request (default: 3).
+        backoff_base : float
+            Delay scale in seconds; retry n waits up to backoff_base * 2**n (default: 0.5).
+        backoff_max : float
+            Upper bound of a single backoff delay without `Retry-After` (default: 30).
+        max_per_host : int
+            Concurrent requests per host, also the size of its connection pool (default: 8).
+        """
+        if max_per_host < 1:
+            raise ValueError("max_per_host must be at least 1.")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_per_host = int(max_per_host)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=self.max_per_host)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Accept-Encoding"] = "gzip, deflate"
+
+        self._host_slots = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "HttpSession":
+        """
+        Process-wide instance used by the loaders and the SUNO client when no session is given.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def _slots(self, url) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._host_slots[host]
+
+    def _backoff(self, attempt: int, backoff_base: float, response=None) -> float:
+        """Seconds to wait before retry number `attempt` (0-based)."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after is not None:
+                try:
+                    return max(0.0, float(retry_after))
+                except ValueError:
+                    try:
+                        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+                    except (TypeError, ValueError):
+                        pass
+        return random.uniform(0, min(self.backoff_max, backoff_base * 2 ** attempt))
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        max_retries: int = None,
+        backoff_base: float = None,
+        rate_limiter=None,
+        **kwargs
+    ) -> requests.Response:
+        """
+        Send a request with retries.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method.
+        url : str
+            Target URL.
+        max_retries : int, optional
+            Override of the default number of retries for this request.
+        backoff_base : float, optional
+            Override of the default backoff scale for this request.
+        rate_limiter : RateLimiter, optional
+            Acquired before every attempt, retries included.
+        **kwargs
+            Passed to `requests.Session.request` (params, data, headers, stream, timeout, ...).
+
+        Returns
+        -------
+        requests.Response
+            The last response; its status may still be an error once retries are exhausted.
+
+        Raises
+        ------
+        requests.RequestException
+            When the last attempt fails without a response.
+        """
+        method = method.upper()
+        kwargs.setdefault("timeout", self.timeout)
+        retries = self.max_retries if max_retries is None else max_retries
+        backoff_base = self.backoff_base if backoff_base is None else backoff_base
+        idempotent = method in self.IDEMPOTENT_METHODS
+        slots = self._slots(url)
+
+        attempt = 0
+        while True:
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+            with slots:
+                try:
+                    response = self.session.request(method, url, **kwargs)
+                except (requests.Timeout, requests.ConnectionError) as e:
+                    if not idempotent or attempt >= retries:
+                        raise
+                    delay = self._backoff(attempt, backoff_base)
+                    print(f"Connection error for {url}: {e}. Retrying in {delay:.1f}s ({attempt + 1}/{retries})...")
+                else:
+                    retryable = response.status_code == 429 or (idempotent and response.status_code in self.RETRY_STATUSES)
+                    if not retryable or attempt >= retries:
+                        return response
+                    delay = self._backoff(attempt, backoff_base, response)
+                    print(f"HTTP {response.status_code} for {url}. Retrying in {delay:.1f}s ({attempt + 1}/{retries})...")
+                    response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        return self.request("HEAD", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
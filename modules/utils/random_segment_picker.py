@@ -3,13 +3,15 @@ import pandas as pd
 
 
 class RandomSegmentPicker:
-    def __init__(self, df, num_rows=5):
+    def __init__(self, df, num_rows=5, seed=None):
         self.df = df.copy()
         self.num_rows = num_rows
-        
+        # own generator when seeded, so picking never reseeds the global numpy state
+        self.random_state = np.random.RandomState(seed) if seed is not None else np.random
+
 
     def pick_random_segment(self, isNormalized: bool = False) -> pd.DataFrame:
-        start = np.random.randint(1, len(self.df) - self.num_rows)
+        start = self.random_state.randint(1, len(self.df) - self.num_rows)
         subset = self.df.iloc[start:start + self.num_rows].copy()
 
         if isNormalized:
@@ -0,0 +1,52 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Thread-safe token-bucket rate limiter shared between worker threads.
+
+    Each call to `acquire` consumes one token. Tokens are refilled at `rate`
+    per second up to `burst`, so short bursts are allowed while the long-run
+    request rate never exceeds `rate`.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Parameters
+        ----------
+        rate : float
+            Sustained number of requests per second.
+        burst : int
+            Maximum number of requests that can be issued back-to-back (default: 1).
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def delay(self) -> float:
+        """
+        Reserve one token and return how long the caller must wait before using it.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """
+        Block until a token is available.
+        """
+        wait = self.delay()
+        if wait > 0:
+            time.sleep(wait)
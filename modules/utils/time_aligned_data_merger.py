@@ -1,6 +1,9 @@
+import numpy as np
 import pandas as pd
 
 class TimeAlignedDataMerger:
+    AGGREGATIONS = ("mean", "sum", "max", "min", "count", "first", "last")
+
     def __init__(self, freq: str = "5H", how: str = "mean"):
         """
         freq : リサンプリング間隔 (例: "1H", "1D")
@@ -32,6 +35,280 @@ class TimeAlignedDataMerger:
         merged = pd.concat([df1_q, df2_q], axis=1)
 
         merged = merged.interpolate(method="linear")
-        
+
         merged = merged.reset_index()
         return merged
+
+    # ========================================
+    # N-way alignment
+    # ========================================
+
+    def _freq_ns(self) -> int:
+        """Return the resampling interval in nanoseconds (fixed frequencies only)."""
+        offset = pd.tseries.frequencies.to_offset(self.freq)
+        try:
+            # Not a type check: pandas 3 no longer treats "D" as a Tick, yet it is a fixed 24 h step
+            return int(offset.nanos)
+        except ValueError:
+            # calendar offsets such as "MS" or "W"
+            raise ValueError(f"Only fixed frequencies are supported for N-way alignment, got '{self.freq}'.") from None
+
+    @staticmethod
+    def _parse_timestamps(values, tz=None):
+        """
+        Parse a timestamp column once into int64 wall-clock nanoseconds.
+
+        Returns
+        -------
+        (np.ndarray, tzinfo or None)
+        """
+        times = pd.DatetimeIndex(pd.to_datetime(values))
+        if times.tz is not None:
+            if tz is not None:
+                times = times.tz_convert(tz)
+            tz = times.tz
+            times = times.tz_localize(None)
+        elif tz is not None:
+            raise ValueError("Cannot align timezone-aware and timezone-naive timestamps.")
+        return times.as_unit("ns").asi8, tz
+
+    def _aggregate_buckets(self, buckets: np.ndarray, values: np.ndarray):
+        """
+        Aggregate values per bucket id with the same kernels as `resample`.
+
+        Returns
+        -------
+        (np.ndarray, np.ndarray)
+            Sorted unique bucket ids and the aggregated value of each bucket.
+        """
+        valid = ~np.isnan(values)
+        agg = pd.Series(values[valid]).groupby(buckets[valid], sort=True).agg(self.how)
+        return agg.index.to_numpy(dtype=np.int64), agg.to_numpy(dtype=float)
+
+    def merge_many(self, inputs, value_names=None, common_range: bool = True, timestamp_name: str = None):
+        """
+        Align any number of time series on one shared resampling grid.
+
+        Each timestamp column is parsed once. All series are trimmed to their
+        common time range, bucketed on a single grid (origin: midnight of the
+        first day, like `resample`'s default), aggregated with `how`, and
+        placed into a preallocated array by bucket offset. Missing buckets are
+        then linearly interpolated, as in `merge`.
+
+        Parameters
+        ----------
+        inputs : list of tuple
+            (df, timestamp column, value column) per series. The value column
+            defaults to "value" when a 2-tuple is given.
+        value_names : list of str, optional
+            Output column names (default: "data1", "data2", ...).
+        common_range : bool
+            Restrict all series to their overlapping time range (default: True).
+        timestamp_name : str, optional
+            Name of the output timestamp column (default: first input's timestamp column).
+
+        Returns
+        -------
+        pd.DataFrame
+            Timestamp column followed by one aligned column per input.
+        """
+        if self.how not in self.AGGREGATIONS:
+            raise ValueError(f"Unsupported aggregation '{self.how}'. Use one of {self.AGGREGATIONS}.")
+        if len(inputs) == 0:
+            raise ValueError("At least one input series is required.")
+        if value_names is None:
+            value_names = [f"data{i + 1}" for i in range(len(inputs))]
+        if len(value_names) != len(inputs):
+            raise ValueError("Length of value_names does not match number of inputs.")
+
+        freq_ns = self._freq_ns()
+        series = []
+        tz = None
+        for spec in inputs:
+            df, col_timestamp = spec[0], spec[1]
+            col_value = spec[2] if len(spec) > 2 else "value"
+            times, tz = self._parse_timestamps(df[col_timestamp], tz)
+            values = df[col_value].to_numpy(dtype=float)
+            order = np.argsort(times, kind="stable")
+            series.append((times[order], values[order]))
+
+        if common_range:
+            start = max(times[0] for times, _ in series if len(times))
+            end = min(times[-1] for times, _ in series if len(times))
+            if start >= end:
+                raise ValueError("No overlapping timestamp interval.")
+            trimmed = []
+            for times, values in series:
+                lo = np.searchsorted(times, start, side="left")
+                hi = np.searchsorted(times, end, side="right")
+                trimmed.append((times[lo:hi], values[lo:hi]))
+            series = trimmed
+
+        first_time = min(times[0] for times, _ in series if len(times))
+        origin = first_time - first_time % (24 * 3600 * 10**9)  # midnight of the first day
+
+        aggregated = []
+        for times, values in series:
+            buckets = (times - origin) // freq_ns
+            aggregated.append(self._aggregate_buckets(buckets, values))
+
+        first_bucket = min(b[0] for b, _ in aggregated if len(b))
+        last_bucket = max(b[-1] for b, _ in aggregated if len(b))
+        n_buckets = int(last_bucket - first_bucket + 1)
+
+        grid = np.full((n_buckets, len(inputs)), np.nan)
+        for col, (buckets, agg) in enumerate(aggregated):
+            if len(buckets) == 0:
+                continue
+            if self.how in ("sum", "count"):
+                # empty buckets inside a series' own range are 0, as with `resample`
+                grid[buckets[0] - first_bucket:buckets[-1] - first_bucket + 1, col] = 0.0
+            grid[buckets - first_bucket, col] = agg
+
+        index = pd.DatetimeIndex(pd.to_datetime(origin + (first_bucket + np.arange(n_buckets)) * freq_ns, unit="ns"))
+        if tz is not None:
+            index = index.tz_localize(tz)
+        index.name = timestamp_name or inputs[0][1]
+
+        merged = pd.DataFrame(grid, index=index, columns=value_names)
+        merged = merged.interpolate(method="linear")
+        return merged.reset_index()
+
+    # ========================================
+    # Out-of-core (chunked) resampling
+    # ========================================
+
+    def resample_stream(self, chunks, timestamp_idx_name: str, value_name: str = "value"):
+        """
+        Resample a time-ordered stream of DataFrame chunks with bounded memory.
+
+        Every chunk is bucketed on the grid `resample` would use (origin:
+        midnight of the first timestamp). Completed buckets are aggregated and
+        yielded immediately, empty buckets in between are filled exactly as
+        `resample` does (NaN, or 0 for "sum"/"count"). Only the still-open last
+        bucket is carried over to the next chunk; its rows are kept rather than
+        a running total so that "mean"/"sum" use the same compensated summation
+        as the in-memory path and the result is bit-identical.
+
+        Rows may be unordered within a chunk, but no row may fall into a
+        bucket that was already emitted.
+
+        `freq` must be a fixed interval such as "1min", "5h" or "1D" (daily
+        buckets over years of per-minute data are the typical use); calendar
+        offsets like "MS" or "W" raise ValueError.
+
+        Parameters
+        ----------
+        chunks : iterable of pd.DataFrame
+            e.g. `DataLoader().iter_chunks(...)`.
+        timestamp_idx_name : str
+            Timestamp column name.
+        value_name : str
+            Value column to aggregate (default: "value").
+
+        Yields
+        ------
+        pd.Series
+            Consecutive pieces of the resampled series.
+        """
+        if self.how not in self.AGGREGATIONS:
+            raise ValueError(f"Unsupported aggregation '{self.how}'. Use one of {self.AGGREGATIONS}.")
+
+        freq_ns = self._freq_ns()
+        origin = tz = next_bucket = None
+        carry_times = np.empty(0, dtype=np.int64)
+        carry_values = np.empty(0, dtype=float)
+
+        for chunk in chunks:
+            if len(chunk) == 0:
+                continue
+            times, tz = self._parse_timestamps(chunk[timestamp_idx_name], tz)
+            values = chunk[value_name].to_numpy(dtype=float)
+
+            if origin is None:
+                first_time = times.min()
+                origin = first_time - first_time % (24 * 3600 * 10**9)
+                next_bucket = int((first_time - origin) // freq_ns)
+
+            if ((times - origin) // freq_ns).min() < next_bucket:
+                raise ValueError("Chunks must be time-ordered: a row falls into an already emitted bucket.")
+
+            times = np.concatenate([carry_times, times])
+            values = np.concatenate([carry_values, values])
+            order = np.argsort(times, kind="stable")
+            times, values = times[order], values[order]
+            buckets = (times - origin) // freq_ns
+
+            open_bucket = int(buckets[-1])
+            split = np.searchsorted(buckets, open_bucket, side="left")
+            carry_times, carry_values = times[split:], values[split:]
+
+            if open_bucket > next_bucket:
+                yield self._emit_buckets(buckets[:split], values[:split], next_bucket, open_bucket,
+                                         origin, freq_ns, tz, timestamp_idx_name, value_name)
+                next_bucket = open_bucket
+
+        if len(carry_times):
+            buckets = (carry_times - origin) // freq_ns
+            yield self._emit_buckets(buckets, carry_values, next_bucket, next_bucket + 1,
+                                     origin, freq_ns, tz, timestamp_idx_name, value_name)
+
+    def _emit_buckets(self, buckets, values, start, stop, origin, freq_ns, tz, index_name, name):
+        """
+        Aggregate sorted rows into the bucket range [start, stop) as a Series.
+        """
+        agg = pd.Series(values).groupby(buckets, sort=True).agg(self.how)
+
+        fill = 0 if self.how in ("sum", "count") else np.nan
+        out = np.full(stop - start, fill, dtype=np.int64 if self.how == "count" else float)
+        out[agg.index.to_numpy(dtype=np.int64) - start] = agg.to_numpy()
+
+        index = pd.DatetimeIndex(pd.to_datetime(origin + np.arange(start, stop) * freq_ns, unit="ns"))
+        if tz is not None:
+            index = index.tz_localize(tz)
+        index.name = index_name
+        return pd.Series(out, index=index, name=name)
+
+    def resample_chunked(self, chunks, timestamp_idx_name: str, value_name: str = "value") -> pd.Series:
+        """
+        Resample a stream of chunks and return the whole (small) resampled series.
+
+        Equivalent to `df[value_name].resample(freq).agg(how)` on the
+        concatenated chunks, without holding the raw data in memory.
+        """
+        pieces = list(self.resample_stream(chunks, timestamp_idx_name, value_name))
+        if not pieces:
+            return pd.Series(dtype=float, name=value_name)
+        return pd.concat(pieces)
+
+    def merge_chunked(self, inputs, value_names=None):
+        """
+        Out-of-core counterpart of `merge` for any number of chunk streams.
+
+        Parameters
+        ----------
+        inputs : list of tuple
+            (iterable of DataFrame chunks, timestamp column[, value column])
+            per series. The value column defaults to "value".
+        value_names : list of str, optional
+            Output column names (default: "data1", "data2", ...).
+
+        Returns
+        -------
+        pd.DataFrame
+            Same layout as `merge`: timestamp column followed by the aligned values.
+        """
+        if value_names is None:
+            value_names = [f"data{i + 1}" for i in range(len(inputs))]
+        if len(value_names) != len(inputs):
+            raise ValueError("Length of value_names does not match number of inputs.")
+
+        resampled = []
+        for spec, name in zip(inputs, value_names):
+            chunks, col_timestamp = spec[0], spec[1]
+            col_value = spec[2] if len(spec) > 2 else "value"
+            resampled.append(self.resample_chunked(chunks, col_timestamp, col_value).to_frame(name=name))
+
+        merged = pd.concat(resampled, axis=1)
+        merged = merged.interpolate(method="linear")
+        return merged.reset_index()
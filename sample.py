@@ -1,173 +1,224 @@
-from modules import Visualizer, TimestampConvertToDatetime, CreateChordsAndMelody, DataLoader, SafecastLoader, TimeSeriesPatternAnalyzer, DataFrameSelector, ConvertElementToAspect, RandomSegmentPicker, SunoMusicGenerator, ValenceArousalToEmotion, FilterCommonTimestampRange, TimeAlignedDataMerger, CrossfadeAudioFiles
+from modules import Visualizer, TimestampConvertToDatetime, CreateChordsAndMelody, TimeSeriesPatternAnalyzer, DataFrameSelector, ConvertElementToAspect, RandomSegmentPicker, SunoMusicGenerator, SunoJobOrchestrator, ValenceArousalToEmotion, FilterCommonTimestampRange, TimeAlignedDataMerger, CrossfadeAudioFiles, PipelineRunner
 import pandas as pd
+import os
 import time
+import uuid
 
-def main():
-    SYSTEM_DATE = time.strftime("%Y_%m%d") # used to generate directory timestamp-based path
-    print(SYSTEM_DATE)
-    
-    NUM_SEGMENT_IN_SECTION = 7
-    
-    # ========================================
-    # load files online or on local
-    # ========================================
-    loader = DataLoader()
-    source1 = "https://api.safecast.org/en-US/measurements.json?latitude=41.8535&longitude=12.4790&radius=1000&limit=500"
-    source2 = "https://api.safecast.org/en-US/measurements.json?latitude=39.0287&longitude=-76.5834&radius=1000&limit=500"
-    # df1 = loader.load(source1)
-    # df2 = loader.load(source2)
-
-    
-    # ========================================
-    # example: load safecast timeseries data
-    # ========================================
-    sc_loader = SafecastLoader(time_sort=False, timestamp_index_name='captured_at', page_limit=1000)
-    # df2 = sc_loader.fetch_device_data(user_id=6, date_from="2015-10-24", date_to="2016-08-01")
-    # df2.to_csv("./data/output/csv/safecast_user_6.csv")
-    
-    # or load from existing csv file
-    # df = pd.read_csv("./data/output/csv/safecast_device_126.csv")
-    
-    # # or load from local file
-    df1 = pd.read_csv("./data/output/csv/safecast_device_126.csv")
-    df2 = pd.read_csv("./data/output/csv/safecast_user_6.csv")
-    
-    # # TODO: dfのtimestamp列にある値をdatetime型に変換し、時系列順に並び替えて出力する
-    # # convert timestamp to datetime if needed
-    # # timestamp_converter = TimestampConvertToDatetime(df)
-    # # converted_df = timestamp_converter.timestamp_convert_to_datetime("captured_at").copy()
-
-    # # export to csv
-    # df1_filtered.to_csv(df1_csv_filename)
-    # print("DataFrame Loaded:")
-    # print(df1_filtered)
-    # print(f"Shape: {df2_filtered.shape}\n")
-    
-    # df2_filtered.to_csv(df2_csv_filename)
-    # print("DataFrame Loaded:")
-    # print(df2_filtered)
-    # print(f"Shape: {df2_filtered.shape}\n")
-    
-    # ========================================
-    # Visualization
-    # ========================================
+NUM_SEGMENT_IN_SECTION = 7
+NUM_SECTIONS = 2
+
+
+# ========================================
+# pipeline stages
+# each stage receives the outputs of its inputs as keyword arguments
+# ========================================
+def file_fingerprint(path):
+    """mtime and size of a local source, so editing the file invalidates its stage"""
+    return lambda: [path, os.path.getmtime(path), os.path.getsize(path)]
+
+
+def load_csv(path):
+    # other sources:
+    # DataLoader().load("https://api.safecast.org/en-US/measurements.json?latitude=41.8535&longitude=12.4790&radius=1000&limit=500")
+    # SafecastLoader(time_sort=False, timestamp_index_name='captured_at', page_limit=1000).fetch_device_data(user_id=6, date_from="2015-10-24", date_to="2016-08-01")
+    # SafecastLoader(...).load_store(user_id=6, store_dir="./data/output/safecast_store/") after sync_device_data
+    return pd.read_csv(path)
+
+
+def filter_common_range(df1, df2):
     # filter only overlapped segment
     filter = FilterCommonTimestampRange(df1, df2)
-    df1_filtered, df2_filtered = filter.filter_common_timestamp_range(col_timestamp_index1="captured_at", col_timestamp_index2="captured_at")
-    
+    return filter.filter_common_timestamp_range(col_timestamp_index1="captured_at", col_timestamp_index2="captured_at")
+
+
+def merge(filtered):
     # merge 2 filtered dataframes
+    df1_filtered, df2_filtered = filtered
     time_merger = TimeAlignedDataMerger()
     df_merged = time_merger.merge(df1_filtered, "captured_at", df2_filtered, "captured_at")
-    df_merged.to_csv("./data/output/csv/df_merged.csv")
     print(df_merged)
-    
-    visualizer = Visualizer(df_merged, df_merged)
-    visualizer.plot_time_series(col_timestamp_index="captured_at", value_index1="data1", value_index2="data2", isSave=True, output_dir="./data/cache/")
-
-    
-    # ========================================
-    # pick random continous segments
-    # ========================================
-    picker = RandomSegmentPicker(df_merged, num_rows=NUM_SEGMENT_IN_SECTION)
-    
-    for idx in range(2): 
-        df_random_7 = picker.pick_random_segment(isNormalized=True)
-        df_random_7.to_csv(f"./data/cache/df_random_7_{idx+1}.csv")
-        print(df_random_7)
-        visualizer = Visualizer(df_random_7, df_random_7)
+    return df_merged
+
+
+def export_merged(merged, output_path):
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    merged.to_csv(output_path)
+    return output_path
+
+
+def plot_merged(merged, output_dir):
+    visualizer = Visualizer(merged, merged)
+    visualizer.plot_time_series(col_timestamp_index="captured_at", value_index1="data1", value_index2="data2", isSave=True, output_dir=output_dir)
+    return os.path.join(output_dir, "time_series.pdf")
+
+
+def pick_segments(merged, num_rows, num_sections, seed):
+    # pick random continous segments (seeded, so a cached result is reproducible)
+    picker = RandomSegmentPicker(merged, num_rows=num_rows, seed=seed)
+    segments = [picker.pick_random_segment(isNormalized=True) for _ in range(num_sections)]
+    for segment in segments:
+        print(segment)
+    return segments
+
+
+def plot_segments(segments, output_dir):
+    paths = []
+    for idx, segment in enumerate(segments):
+        filename = f"df_random_7_{idx+1}.png"
+        visualizer = Visualizer(segment, segment)
         visualizer.plot_time_series(
-            col_timestamp_index="captured_at", 
-            value_index1="data1", 
-            value_index2="data2", 
-            isSave=True, 
-            output_dir=f"./data/cache/", 
-            filename=f"df_random_7_{idx+1}.png"
+            col_timestamp_index="captured_at",
+            value_index1="data1",
+            value_index2="data2",
+            isSave=True,
+            output_dir=output_dir,
+            filename=filename
             )
-        
-    
-    # ========================================
-    # convert values in rows to musical aspect (2 rows)
-    # ========================================
+        paths.append(os.path.join(output_dir, filename))
+    return paths
+
+
+def map_valence_arousal(segments, valence_thresh=None, arousal_thresh=None):
+    # convert values in rows to musical aspect
+    # thresholds default to the (min, max) of each segment
     valence_list = []
     arousal_list = []
-    emotion_list = []
 
-    for idx in range(2):
-        random_segment_path = f"./data/cache/df_random_7_{idx+1}.csv"
-        df_random_7 = pd.read_csv(random_segment_path)
+    for segment in segments:
+        element_converter = ConvertElementToAspect(segment.copy())
 
-        element_converter = ConvertElementToAspect(df_random_7)
+        v_min, v_max = valence_thresh or (segment["data1"].min(), segment["data1"].max())
+        a_min, a_max = arousal_thresh or (segment["data2"].min(), segment["data2"].max())
+        valence_array = element_converter.convert_element_to_valence('data1', min_thresh=v_min, max_thresh=v_max)
+        arousal_array = element_converter.convert_element_to_arousal('data2', min_thresh=a_min, max_thresh=a_max)
 
-        # 各行分の valence / arousal を生成
-        valence_array = element_converter.convert_element_to_valence(
-            'data1',
-            min_thresh=df_random_7["data1"].min(),
-            max_thresh=df_random_7["data1"].max()
-        )
+        valence_list.append(valence_array)
+        arousal_list.append(arousal_array)
 
-        arousal_array = element_converter.convert_element_to_arousal(
-            'data2',
-            min_thresh=df_random_7["data2"].min(),
-            max_thresh=df_random_7["data2"].max()
-        )
+    print(f"\nvalence_list: {valence_list}\n arousal_list: {arousal_list}")
+    return {"valence": valence_list, "arousal": arousal_list}
 
-        # DataFrame の「最後の列」として追加
-        df_random_7["valence"] = valence_array
-        df_random_7["arousal"] = arousal_array
 
-        # 集計用（必要な場合）
-        valence_list.append(valence_array)
-        arousal_list.append(arousal_array)
-        emotion_list.append(emotion_list)
+def export_segments(segments, mapping, output_dir):
+    # segments annotated with their valence / arousal
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for idx, segment in enumerate(segments):
+        path = os.path.join(output_dir, f"df_random_7_{idx+1}.csv")
+        segment.assign(valence=mapping["valence"][idx], arousal=mapping["arousal"][idx]).to_csv(path, index=False)
+        paths.append(path)
+    return paths
 
-        # CSV に保存（上書き or 別名保存）
-        df_random_7.to_csv(random_segment_path, index=False)
 
-    print(f"\nvalence_list: {valence_list}\n arousal_list: {arousal_list}")
-    e = ValenceArousalToEmotion(valence_list, arousal_list)
-    emotion_list = e.convert_valence_arousal_to_emotion() 
+def to_emotion(mapping):
+    e = ValenceArousalToEmotion(mapping["valence"], mapping["arousal"])
+    emotion_list = e.convert_valence_arousal_to_emotion()
     print(emotion_list)
-    print(len(emotion_list))
+    return emotion_list
 
-    return 0
-    
-    # ========================================
+
+def create_melody(mapping, output_dir, seed):
     # create chords and melody from specified valence-arousal coordinates
-    # ========================================
-    # melody_generator = CreateChordsAndMelody()
-    # melody_dir_path = melody_generator.create_midi_and_wav(valence_array, arousal_array)
-    
-    # ========================================
+    points = sorted({
+        (valence, arousal)
+        for valence_row, arousal_row in zip(mapping["valence"], mapping["arousal"])
+        for valence, arousal in zip(valence_row, arousal_row)
+    })
+    melody_generator = CreateChordsAndMelody(file_save_path=output_dir, cache_dir="./data/cache/melody/")
+    return melody_generator.create_batch(points, seed=seed)
+
+
+def generate_suno(mapping, emotion, style, upload_url_base, file_save_path):
     # connect SUNO API and generate music
-    # ======================================== 
-    style = 'Electronic Music'
-    suno_generator = SunoMusicGenerator(style=style)
-    upload_url_base = 'https://audio-eval-2025-05.web.app/melody_database/'
-    task_ids = []
-    upload_filenames = []
-
-    for idx_row in range(len(emotion_list)):
-        for idx_col in range(len(emotion_list[0])):
-            upload_filename = f"melody_val{valence_list[idx_row][idx_col]}_aro{arousal_list[idx_row][idx_col]}.mp3"
-            upload_filenames.append(upload_filename)
-            text_prompt = emotion_list[idx_row][idx_col]
+    suno_generator = SunoMusicGenerator(style=style, cache_dir="./data/cache/suno/")
+    jobs = []
+    for idx_row in range(len(emotion)):
+        for idx_col in range(len(emotion[0])):
+            upload_filename = f"melody_val{mapping['valence'][idx_row][idx_col]}_aro{mapping['arousal'][idx_row][idx_col]}.mp3"
+            text_prompt = emotion[idx_row][idx_col]
             upload_url = f"{upload_url_base}{upload_filename}"
             print(upload_url, text_prompt)
-            
-            # create tasks
-            task_ids.append(suno_generator.generate_music(text_prompt, upload_url))
-            time.sleep(2) # in order to avoid API rate limitation
-        
-        print(f"task no. {idx}")
-        time.sleep(20) # in order to avoid API rate limitation
-        
-    
-    # actually download tracks when finished
-    for idx, task_id in enumerate(task_ids):
-        audio_url = suno_generator.poll_suno_task(task_id, interval=30)
-        downloaded_filename = suno_generator.download_tracks(audio_url, download_filename=f"{idx+1}_{upload_filenames[idx]}")
-        print(f"{downloaded_filename} downloaded")
+            jobs.append({
+                "prompt": text_prompt,
+                "upload_url": upload_url,
+                "download_filename": f"{len(jobs)+1}_{upload_filename}",
+            })
+
+    # submit, poll and download concurrently under the API rate limit
+    # when this machine is reachable from SUNO (e.g. through a tunnel), completions can be pushed instead of polled:
+    # receiver = SunoCallbackReceiver(host="0.0.0.0", port=8787, public_url="https://<tunnel-host>/suno/callback")
+    # orchestrator = SunoJobOrchestrator(suno_generator, max_in_flight=4, requests_per_second=0.5, receiver=receiver)
+    orchestrator = SunoJobOrchestrator(suno_generator, max_in_flight=4, requests_per_second=0.5, poll_interval=30, file_save_path=file_save_path)
+    results = orchestrator.run(jobs)
+    failed = [r["download_filename"] for r in results if r["error"] is not None]
+    print(f"{len(results) - len(failed)}/{len(results)} tracks downloaded, failed: {failed}")
+    return results
+
+
+def crossfade(suno, output_dir, crossfade_duration_ms, clip_total_length_ms):
+    # mix exactly this run's tracks, in job order, into a file of its own
+    paths = [r["path"] for r in suno if r["path"] is not None]
+    if not paths:
+        raise RuntimeError("No SUNO track was downloaded.")
+    output_path = os.path.join(output_dir, f"crossfade_{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}.mp3")
+    return CrossfadeAudioFiles.crossfade_files(
+        paths,
+        output_path,
+        crossfade_duration_ms=crossfade_duration_ms,
+        clip_total_length_ms=clip_total_length_ms,
+        cache_dir="./data/cache/pcm/"
+    )
+
+
+def build_pipeline(cache_dir="./data/cache/pipeline/"):
+    """
+    Declare the stages as a DAG. Outputs are cached by a hash of their inputs
+    and parameters, so changing e.g. a mapping threshold reruns only the mapping
+    and what depends on it.
+    """
+    df1_path = "./data/output/csv/safecast_device_126.csv"
+    df2_path = "./data/output/csv/safecast_user_6.csv"
+
+    runner = PipelineRunner(cache_dir=cache_dir)
+    runner.add_stage("df1", load_csv, params={"path": df1_path}, fingerprint=file_fingerprint(df1_path))
+    runner.add_stage("df2", load_csv, params={"path": df2_path}, fingerprint=file_fingerprint(df2_path))
+    runner.add_stage("filtered", filter_common_range, inputs=["df1", "df2"])
+    runner.add_stage("merged", merge, inputs=["filtered"])
+    # stages that write files are never cached, so a deleted or stale file is always rewritten
+    runner.add_stage("export_merged", export_merged, inputs=["merged"], params={"output_path": "./data/output/csv/df_merged.csv"}, cache=False)
+    runner.add_stage("plot_merged", plot_merged, inputs=["merged"], params={"output_dir": "./data/cache/"}, cache=False, serial=True)
+    runner.add_stage("segments", pick_segments, inputs=["merged"], params={"num_rows": NUM_SEGMENT_IN_SECTION, "num_sections": NUM_SECTIONS, "seed": 0})
+    runner.add_stage("plot_segments", plot_segments, inputs=["segments"], params={"output_dir": "./data/cache/"}, cache=False, serial=True)
+    runner.add_stage("mapping", map_valence_arousal, inputs=["segments"])
+    runner.add_stage("export_segments", export_segments, inputs=["segments", "mapping"], params={"output_dir": "./data/cache/"}, cache=False)
+    runner.add_stage("emotion", to_emotion, inputs=["mapping"])
+    runner.add_stage("melody", create_melody, inputs=["mapping"], params={"output_dir": "./data/output/generated_melody/", "seed": 0})
+    runner.add_stage("suno", generate_suno, inputs=["mapping", "emotion"], params={
+        "style": "Electronic Music",
+        "upload_url_base": "https://audio-eval-2025-05.web.app/melody_database/",
+        "file_save_path": "./data/output/generated_music_suno",
+    }, cache=False)
+    runner.add_stage("crossfade", crossfade, inputs=["suno"], params={
+        "output_dir": "./data/output/crossfade/",
+        "crossfade_duration_ms": 5000,
+        "clip_total_length_ms": 30000,
+    }, cache=False)
+    return runner
+
+
+def main():
+    SYSTEM_DATE = time.strftime("%Y_%m%d") # used to generate directory timestamp-based path
+    print(SYSTEM_DATE)
+
+    runner = build_pipeline()
+    # e.g. runner.set_params("mapping", valence_thresh=(0.2, 0.8)) reruns only mapping and its dependents
+    outputs = runner.run(targets=["export_merged", "plot_merged", "plot_segments", "export_segments", "emotion"])
+    print(len(outputs["emotion"]))
+
+    # full run including melody rendering, SUNO generation and crossfade:
+    # runner.run(targets=["melody", "crossfade"])
+    return 0
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()